@@ -1,14 +1,18 @@
 import argparse
 import glob
+import json
 import logging
 import os
 import shutil
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 from PIL import Image
 from tqdm import tqdm
 
-from inference import load_model, predict
+from inference import format_predictions, load_model, predict_batch
 from preprocessing import preprocess
 from window import run_interface
 
@@ -17,13 +21,13 @@ from window import run_interface
 logging.basicConfig(level=logging.INFO)
 
 IMAGE_EXTENSIONS = {
-    ".jpg",
-    ".jpeg",
-    ".png",
-    ".bmp",
-    ".tif",
-    ".tiff",
-    ".webp",
+    "jpg",
+    "jpeg",
+    "png",
+    "bmp",
+    "tif",
+    "tiff",
+    "webp",
 }
 
 
@@ -52,6 +56,182 @@ def load_labels(label_file: str) -> List[str]:
         return []
 
 
+def load_cached_predictions(pred_file: str) -> List[Tuple[str, float]]:
+    """Load cached prediction lines from ``pred_file``.
+
+    The whole file is parsed in one ``np.loadtxt`` call, which is far
+    faster than splitting line by line in Python when folders hold
+    millions of cached boxes.
+
+    Args:
+        pred_file (str): Path to a cached prediction file.
+
+    Returns:
+        List[Tuple[str, float]]: ``("cls xc yc w h", confidence)`` pairs.
+    """
+
+    if not os.path.exists(pred_file):
+        return []
+    try:
+        data = np.loadtxt(pred_file, dtype=np.float64, ndmin=2)
+    except (OSError, ValueError) as e:
+        logging.error("Failed to read prediction file %s: %s", pred_file, e)
+        return []
+    if data.size == 0:
+        return []
+    classes = data[:, 0].astype(np.int64)
+    xywhn = data[:, 1:5]
+    confs = (
+        data[:, 5]
+        if data.shape[1] >= 6
+        else np.zeros(len(data), dtype=np.float64)
+    )
+    return format_predictions(classes, xywhn, confs)
+
+
+def fast_copy(src: str, dst: str) -> None:
+    """Copy ``src`` to ``dst`` without reading the file when possible.
+
+    A hard link is attempted first (an O(1) metadata operation on the same
+    filesystem), then an in-kernel ``copy_file_range``, before falling back
+    to a regular byte copy.  Because the corrected file may share an inode
+    with the original, writers must unlink it before rewriting.
+    """
+
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        size = os.path.getsize(src)
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            # copy_file_range may copy fewer bytes than requested, so
+            # loop until the whole file has been transferred; a stalled
+            # copy falls through to the byte-copy fallback rather than
+            # leaving a silently truncated file behind.
+            copied = 0
+            while copied < size:
+                n = os.copy_file_range(
+                    fsrc.fileno(), fdst.fileno(), size - copied
+                )
+                if n == 0:
+                    raise OSError("copy_file_range made no progress")
+                copied += n
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+
+
+def load_skip_cache(cache_file: str) -> dict:
+    """Load the skip cache mapping image basenames to mtime keys.
+
+    Args:
+        cache_file (str): Path to the JSON cache file.
+
+    Returns:
+        dict: Cached entries, or an empty dict when missing or corrupt.
+    """
+
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_skip_cache(cache_file: str, cache: dict) -> None:
+    """Atomically write the skip cache to disk."""
+
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logging.error("Failed to write skip cache %s: %s", cache_file, e)
+
+
+def skip_key(img_path: str, label_file: str) -> Optional[List[float]]:
+    """Build a cache key from the image and label modification times."""
+
+    try:
+        img_mtime = os.path.getmtime(img_path)
+    except OSError:
+        return None
+    label_mtime = (
+        os.path.getmtime(label_file) if os.path.exists(label_file) else 0.0
+    )
+    return [img_mtime, label_mtime]
+
+
+def iter_preprocessed(
+    image_paths: Iterable[str],
+    workers: int = 4,
+    lookahead: int = 8,
+    cache_dir: Optional[str] = None,
+) -> Iterator[Tuple[str, Optional[Image.Image]]]:
+    """Yield ``(path, preprocessed image)`` pairs with background prefetch.
+
+    Image decoding and :func:`preprocess` run in a small thread pool so the
+    next few images are already loaded while the current one is being
+    inferred.  At most ``lookahead`` decoded images are held in flight to
+    bound memory usage.  Images that fail to load yield ``None``.
+
+    When ``cache_dir`` is given, preprocessed pixel buffers are stored as
+    ``.npy`` files and memory-mapped back on later runs, skipping the
+    JPEG/PNG decode entirely.
+
+    Args:
+        image_paths (Iterable[str]): Paths of images to load in order.
+        workers (int): Number of decoding threads.
+        lookahead (int): Maximum number of decoded images kept in flight.
+        cache_dir (Optional[str]): Directory for cached pixel buffers.
+
+    Returns:
+        Iterator[Tuple[str, Optional[Image.Image]]]: Path/image pairs in the
+        original order.
+    """
+
+    def _load(path: str) -> Optional[Image.Image]:
+        cache_path = None
+        if cache_dir is not None:
+            base = os.path.splitext(os.path.basename(path))[0]
+            cache_path = os.path.join(cache_dir, base + ".npy")
+            if os.path.exists(cache_path):
+                try:
+                    return Image.fromarray(np.load(cache_path, mmap_mode="r"))
+                except (OSError, ValueError) as e:
+                    logging.error(
+                        "Failed to read image cache %s: %s", cache_path, e
+                    )
+        try:
+            image = Image.open(path).convert("RGB")
+        except (OSError, ValueError) as e:
+            logging.error("Failed to open image %s: %s", path, e)
+            return None
+        processed = preprocess(image)
+        if cache_path is not None:
+            try:
+                np.save(cache_path, np.asarray(processed))
+            except OSError as e:
+                logging.error(
+                    "Failed to write image cache %s: %s", cache_path, e
+                )
+        return processed
+
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path in image_paths:
+            pending.append((path, pool.submit(_load, path)))
+            if len(pending) >= lookahead:
+                queued_path, future = pending.popleft()
+                yield queued_path, future.result()
+        while pending:
+            queued_path, future = pending.popleft()
+            yield queued_path, future.result()
+
+
 def main():
     parser = argparse.ArgumentParser(description="YOLO Annotation Corrector")
     parser.add_argument("--images", required=True, help="Path to images directory")
@@ -63,6 +243,26 @@ def main():
         action="store_true",
         help="Use cached predictions from a 'predicted_labels' folder",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["pt", "onnx", "engine"],
+        default="pt",
+        help="Inference backend; onnx/engine export the weights once and reuse them",
+    )
+    parser.add_argument(
+        "--cache-images",
+        action="store_true",
+        help=(
+            "Cache preprocessed pixel buffers as .npy files so re-runs skip "
+            "image decoding (clear the cache after changing preprocessing)"
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=8,
+        help="Number of images accumulated before running inference",
+    )
     args = parser.parse_args()
 
     os.makedirs(args.corrected, exist_ok=True)
@@ -70,69 +270,136 @@ def main():
         dst = os.path.join(args.corrected, os.path.basename(src))
         if not os.path.exists(dst):
             try:
-                shutil.copy(src, dst)
+                fast_copy(src, dst)
             except OSError as e:
                 logging.error("Failed to copy %s to %s: %s", src, dst, e)
 
     pred_dir = os.path.join(args.corrected, "predicted_labels")
     os.makedirs(pred_dir, exist_ok=True)
 
-    model = load_model(args.model)
+    cache_file = os.path.join(args.corrected, ".cache", "skipmap.json")
+    skip_cache = load_skip_cache(cache_file)
+
+    image_cache_dir = None
+    if args.cache_images:
+        image_cache_dir = os.path.join(args.corrected, ".cache", "preprocessed")
+        os.makedirs(image_cache_dir, exist_ok=True)
+
+    model = load_model(args.model, backend=args.backend)
     class_names: List[str] = getattr(getattr(model, "model", None), "names", [])
     if args.predictions:
         # When using cached predictions we still need the class names but can
         # discard the model to avoid unnecessary memory usage.
         model = None
-    image_paths = sorted(
-        p
-        for p in glob.glob(os.path.join(args.images, '*'))
-        if os.path.splitext(p)[1].lower() in IMAGE_EXTENSIONS
-    )
+    # A single scandir pass avoids the extra stat per entry that the
+    # previous glob + splitext combination incurred on large folders.
+    with os.scandir(args.images) as entries:
+        image_paths = sorted(
+            entry.path
+            for entry in entries
+            if entry.is_file()
+            and entry.name.rpartition('.')[2].lower() in IMAGE_EXTENSIONS
+        )
+
+    # Drop images whose predictions already matched their labels on a
+    # previous run and whose files have not changed since.
+    review_paths = []
+    for img_path in image_paths:
+        base = os.path.splitext(os.path.basename(img_path))[0]
+        label_file = os.path.join(args.corrected, base + '.txt')
+        key = skip_key(img_path, label_file)
+        entry = skip_cache.get(base)
+        if entry and key is not None and entry[0] == key and entry[1]:
+            continue
+        review_paths.append(img_path)
 
     images = []
     predictions = []
     labels = []
     label_files = []
 
+    def review_image(img_path, label_file, label_lines, pred_lines):
+        """Queue an image for review when predictions and labels differ."""
 
-    for img_path in tqdm(image_paths, desc="Processing images"):
-
-        try:
-          image = Image.open(img_path).convert('RGB')
-        except (OSError, ValueError) as e:
-          logging.error("Failed to open image %s: %s", img_path, e)
-          continue
-        processed = preprocess(image)
+        # Length check first so most differing images never hash a line.
+        matched = len(pred_lines) == len(label_lines) and frozenset(
+            line for line, _ in pred_lines
+        ) == frozenset(label_lines)
         base = os.path.splitext(os.path.basename(img_path))[0]
-        label_file = os.path.join(args.corrected, base + '.txt')
-        label_lines = load_labels(label_file)
-        pred_file = os.path.join(pred_dir, base + '.txt')
-    
-        if args.predictions:
-            pred_lines: List[tuple[str, float]] = []
-            if os.path.exists(pred_file):
-                with open(pred_file) as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        parts = line.split()
-                        conf = float(parts[5]) if len(parts) >= 6 else 0.0
-                        pred_lines.append((" ".join(parts[:5]), conf))
-        else:
-            pred_lines = predict(model, processed)
-            with open(pred_file, "w") as f:
-                for line, conf in pred_lines:
-                    f.write(f"{line} {conf:.6f}\n")
-    
-        if set(line for line, _ in pred_lines) == set(label_lines):
-            continue
-    
-        images.append(processed)
+        key = skip_key(img_path, label_file)
+        if key is not None:
+            skip_cache[base] = [key, matched]
+        if matched:
+            return
+        # Store the path, not the decoded image; the window loads lazily.
+        images.append(img_path)
         predictions.append([{"line": line, "conf": conf, "accepted": False} for line, conf in pred_lines])
         labels.append([{"line": line, "kept": True} for line in label_lines])
         label_files.append(label_file)
 
+    batch_images: List = []
+    batch_meta: List[tuple] = []
+
+    def flush_batch():
+        """Run inference on the accumulated batch and cache the results."""
+
+        if not batch_images:
+            return
+        results = predict_batch(model, batch_images, batch=args.batch)
+        pbar.update(len(batch_images))
+        for (img_path, label_file, label_lines, pred_file), pred_lines in zip(
+            batch_meta, results
+        ):
+            payload = "".join(f"{line} {conf:.6f}\n" for line, conf in pred_lines)
+            with open(pred_file, "w") as f:
+                f.write(payload)
+            review_image(img_path, label_file, label_lines, pred_lines)
+        batch_images.clear()
+        batch_meta.clear()
+
+    # Batched progress updates: with fast cached runs the per-image
+    # terminal writes themselves become measurable, so let tqdm coalesce.
+    pbar = tqdm(
+        total=len(review_paths),
+        desc="Processing images",
+        mininterval=0.5,
+        miniters=max(1, len(review_paths) // 200),
+    )
+    if args.predictions:
+        # Cached predictions and labels are plain text, so the skip check
+        # needs no pixels at all; images are only decoded later, lazily,
+        # for the ones that actually reach the review window.
+        for img_path in review_paths:
+            base = os.path.splitext(os.path.basename(img_path))[0]
+            label_file = os.path.join(args.corrected, base + '.txt')
+            label_lines = load_labels(label_file)
+            pred_file = os.path.join(pred_dir, base + '.txt')
+            pred_lines = load_cached_predictions(pred_file)
+            review_image(img_path, label_file, label_lines, pred_lines)
+            pbar.update(1)
+    else:
+        prefetched = iter_preprocessed(
+            review_paths, lookahead=2 * args.batch, cache_dir=image_cache_dir
+        )
+        for img_path, processed in prefetched:
+
+            if processed is None:
+                pbar.update(1)
+                continue
+            base = os.path.splitext(os.path.basename(img_path))[0]
+            label_file = os.path.join(args.corrected, base + '.txt')
+            label_lines = load_labels(label_file)
+            pred_file = os.path.join(pred_dir, base + '.txt')
+
+            batch_images.append(processed)
+            batch_meta.append((img_path, label_file, label_lines, pred_file))
+            if len(batch_images) >= args.batch:
+                flush_batch()
+
+        flush_batch()
+    pbar.close()
+    save_skip_cache(cache_file, skip_cache)
+
     if images:
         run_interface(images, predictions, labels, label_files, class_names)
 
@@ -17,26 +17,76 @@ from __future__ import annotations
 
 from typing import List, Optional, TYPE_CHECKING
 
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QColor, QPen
-from PyQt6.QtWidgets import QGraphicsRectItem, QGraphicsTextItem
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QBrush, QColor, QFontMetricsF, QPen
+from PyQt6.QtWidgets import (
+    QApplication,
+    QGraphicsItem,
+    QGraphicsRectItem,
+    QGraphicsScene,
+    QGraphicsSimpleTextItem,
+)
 
 if TYPE_CHECKING:  # pragma: no cover - used only for type hints
     from window import AnnotationWindow
 
 
+# %-formatting of fixed-precision floats is measurably faster than an
+# f-string in CPython, and this template runs on every resize tick.
+_YOLO_LINE_FMT = "%d %.6f %.6f %.6f %.6f"
+
+# The toggle icons only ever show "+" in green or "-" in red; sharing
+# the brushes and comparing the current text lets _update_icon skip the
+# update entirely when the state did not change (rebinding pooled items
+# hits this path once per box per navigation).
+_ICON_ADD_BRUSH = QBrush(QColor("green"))
+_ICON_REMOVE_BRUSH = QBrush(QColor("red"))
+
+# Shared pens and colors.  QPen/QColor construction parses color names
+# and allocates per call, and setPen copies its argument anyway, so one
+# module-level instance serves every box and every repaint.
+_PRED_PEN = QPen(QColor("red"), 2)
+_GT_PEN = QPen(QColor("green"), 2)
+_NO_PEN = QPen(Qt.PenStyle.NoPen)
+_LABEL_BG = QColor("white")
+_LABEL_FG = QColor("black")
+
+# Metrics for the application font, resolved lazily because the font is
+# only known once the QApplication exists.
+_LABEL_METRICS: Optional[QFontMetricsF] = None
+
+
+def _label_width(text: str) -> float:
+    """Painted width of a box label (text plus backdrop padding)."""
+
+    global _LABEL_METRICS
+    if _LABEL_METRICS is None:
+        _LABEL_METRICS = QFontMetricsF(QApplication.font())
+    return _LABEL_METRICS.horizontalAdvance(text) + 4.0
+
+
 def rect_to_yolo_line(rect: QRectF, cls_id: int, img_w: int, img_h: int) -> str:
     """Convert a ``QRectF`` to a YOLO-format label line."""
 
-    xc = (rect.left() + rect.width() / 2) / img_w
-    yc = (rect.top() + rect.height() / 2) / img_h
-    w = rect.width() / img_w
-    h = rect.height() / img_h
-    return f"{cls_id} {xc:.6f} {yc:.6f} {w:.6f} {h:.6f}"
+    inv_w = 1.0 / img_w
+    inv_h = 1.0 / img_h
+    xc = (rect.left() + rect.width() * 0.5) * inv_w
+    yc = (rect.top() + rect.height() * 0.5) * inv_h
+    return _YOLO_LINE_FMT % (
+        cls_id,
+        xc,
+        yc,
+        rect.width() * inv_w,
+        rect.height() * inv_h,
+    )
+
 
+class ToggleIcon(QGraphicsSimpleTextItem):
+    """Clickable icon that delegates the mouse press to a callback.
 
-class ToggleIcon(QGraphicsTextItem):
-    """Clickable icon that delegates the mouse press to a callback."""
+    A simple text item paints through plain ``QPainter.drawText`` —
+    no QTextDocument or HTML layout engine per icon.
+    """
 
     def __init__(self, parent, callback) -> None:
         super().__init__(parent)
@@ -54,6 +104,10 @@ class ToggleIcon(QGraphicsTextItem):
 class PredBox(QGraphicsRectItem):
     """Graphics item for a predicted box."""
 
+    # No __slots__ here: the sip wrapper base class already gives every
+    # instance a __dict__, so slots would add descriptor storage without
+    # removing the dict.
+
     HANDLE_SIZE = 10
 
     def __init__(
@@ -67,43 +121,148 @@ class PredBox(QGraphicsRectItem):
     ) -> None:
         super().__init__(rect)
         self.window = window
-        self.state = state
-        self.line = state["line"]
-        self.conf = state["conf"]
-        self.accepted = state.get("accepted", False)
-        self.setPen(QPen(QColor("red"), 2))
-        self.img_w = img_w
-        self.img_h = img_h
+        self.class_names = class_names
+        self.setPen(_PRED_PEN)
+        # Boxes are static outside resize drags, so let Qt keep their
+        # rendering in a device-coordinate pixmap; pans blit the cache
+        # instead of re-stroking the rect and label.  Pen changes and
+        # resizes invalidate the cache automatically.
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self._resizing: Optional[str] = None
 
-        cls_id = int(self.line.split()[0])
-        cls_name = class_names[cls_id] if 0 <= cls_id < len(class_names) else str(cls_id)
-        self.label = QGraphicsTextItem(self)
-        self.label.setHtml(
-            f"<div style='background-color:white;'>{cls_name}:{self.conf:.2f}</div>"
-        )
-        self.label.setPos(rect.left(), rect.top() - 20)
+        # The icon child is built lazily on first paint (or first icon
+        # access); boxes that never enter the viewport never pay for it.
+        self.children_group: Optional[QGraphicsRectItem] = None
+        self._icon: Optional[ToggleIcon] = None
+        self._label_width = 0.0
+
+        self.rebind(rect, state, img_w, img_h)
+
+    @property
+    def icon(self) -> ToggleIcon:
+        """The clickable +/- indicator, created on first access."""
+
+        self._ensure_children()
+        return self._icon
 
-        # A clickable + / - icon allowing users to toggle acceptance even when
+    def _ensure_children(self) -> None:
+        if self._icon is not None:
+            return
+        r = self.rect()
+        # The toggle icon hangs off an invisible anchor item placed at
+        # the rectangle's top-left, so a resize repositions it with one
+        # setPos call.  A plain item (not QGraphicsItemGroup) keeps mouse
+        # events flowing to the icon.
+        self.children_group = QGraphicsRectItem(QRectF(), self)
+        self.children_group.setPen(_NO_PEN)
+        self.children_group.setPos(r.left(), r.top())
+        # A clickable + / - icon allowing users to toggle state even when
         # the icon sits outside of the rectangle's bounds.
-        self.icon = ToggleIcon(self, self._toggle)
+        self._icon = ToggleIcon(self.children_group, self._toggle)
+        self._icon_offset_h = r.height()
+        self._icon.setPos(0, r.height() + 2)
         self._update_icon()
-        # Place the indicator at the bottom-left of the rectangle so it does not
-        # interfere with the resize handles located at the corners.
-        self.icon.setPos(rect.left(), rect.bottom() + 2)
+
+    def rebind(
+        self, rect: QRectF, state: dict, img_w: int, img_h: int
+    ) -> None:
+        """Point this item at a new state dict and geometry in place.
+
+        Navigation reuses pooled items instead of constructing new Qt
+        graphics items per image, so everything ``__init__`` derives from
+        the state has to be refreshed here.
+        """
+
+        self.setRect(rect)
+        self.state = state
+        self.conf = state["conf"]
+        self.accepted = state.get("accepted", False)
+        # Only the reciprocals are kept; the serialization path
+        # multiplies, and two fewer attributes per box adds up on
+        # crowded images.
+        self.inv_w = 1.0 / img_w
+        self.inv_h = 1.0 / img_h
+        self._resizing = None
+
+        # Reuse the parse cached by the window when available; the line is
+        # re-serialized on every resize tick and re-splitting it there is
+        # needless work.
+        parsed = state.get("_parsed")
+        self.cls_id = (
+            parsed[0]
+            if parsed is not None
+            else int(state["line"].split(maxsplit=1)[0])
+        )
+        cls_name = (
+            self.class_names[self.cls_id]
+            if 0 <= self.cls_id < len(self.class_names)
+            else str(self.cls_id)
+        )
+        self.label_text = f"{cls_name}:{self.conf:.2f}"
+        self._update_label_width()
+        if self._icon is not None:
+            self.children_group.setPos(rect.left(), rect.top())
+            self._update_icon()
+            # The indicator sits at the bottom-left of the rectangle so it
+            # does not interfere with the corner resize handles.
+            self._icon_offset_h = rect.height()
+            self._icon.setPos(0, rect.height() + 2)
+
+
+    # Extra headroom in the bounding rect for the label painted above the box.
+    LABEL_MARGIN = 24
+
+    def _update_label_width(self) -> None:
+        """Track the painted label width for :meth:`boundingRect`."""
+
+        width = _label_width(self.label_text)
+        if width != self._label_width:
+            self.prepareGeometryChange()
+            self._label_width = width
+
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        r = super().boundingRect().adjusted(0, -self.LABEL_MARGIN, 0, 0)
+        # The label backdrop starts at the box's left edge and may be
+        # wider than the box; without the extension both repainting and
+        # the device-coordinate cache clip it at the box edge.
+        needed = self.rect().left() + self._label_width
+        if needed > r.right():
+            r.setRight(needed)
+        return r
+
+    def paint(self, painter, option, widget=None) -> None:  # type: ignore[override]
+        """Draw the rectangle and its label in one pass.
+
+        Painting the label here avoids a ``QGraphicsTextItem`` child per
+        box, whose QTextDocument construction dominates scene build time
+        on crowded images.
+        """
+
+        self._ensure_children()
+        super().paint(painter, option, widget)
+        r = self.rect()
+        fm = painter.fontMetrics()
+        bg = QRectF(
+            r.left(),
+            r.top() - fm.height() - 4,
+            fm.horizontalAdvance(self.label_text) + 4,
+            fm.height() + 2,
+        )
+        painter.fillRect(bg, _LABEL_BG)
+        painter.setPen(_LABEL_FG)
+        painter.drawText(QPointF(r.left() + 2, r.top() - 7), self.label_text)
 
     def _update_icon(self) -> None:
         """Display a '+' to add or a '-' to remove a prediction."""
 
-        if self.accepted:
-            symbol = "-"
-            color = "red"
-        else:
-            symbol = "+"
-            color = "green"
-        self.icon.setHtml(
-            f"<div style='color:{color};background-color:white;'>{symbol}</div>"
-        )
+        if self._icon is None:
+            return
+        symbol = "-" if self.accepted else "+"
+        if symbol != self._icon.text():
+            self._icon.setText(symbol)
+            self._icon.setBrush(
+                _ICON_REMOVE_BRUSH if self.accepted else _ICON_ADD_BRUSH
+            )
 
     # ------------------------------------------------------------------
     # Resizing helpers
@@ -129,17 +288,31 @@ class PredBox(QGraphicsRectItem):
         elif self._resizing == "bottomright":
             r.setBottomRight(pos)
         self.setRect(r)
-        self._update_from_rect()
+        # Geometry-only update while the drag is live; serializing the
+        # YOLO line and re-flagging predictions wait for mouse release.
+        self._update_children(r)
+
+    def _update_children(self, r: QRectF) -> None:
+        if self._icon is None:
+            return
+        # One anchor move covers the icon; it only needs its own update
+        # when the rectangle's height changed.
+        self.children_group.setPos(r.left(), r.top())
+        if r.height() != self._icon_offset_h:
+            self._icon_offset_h = r.height()
+            self._icon.setPos(0, r.height() + 2)
 
     def _update_from_rect(self) -> None:
-        cls_id = int(self.line.split()[0])
-        self.line = rect_to_yolo_line(self.rect(), cls_id, self.img_w, self.img_h)
-        self.state["line"] = self.line
-        self.label.setPos(self.rect().left(), self.rect().top() - 20)
-        self.icon.setPos(self.rect().left(), self.rect().bottom() + 2)
-        if self.window.final_checkbox.isChecked():
-            self.window.update_final_items()
-        self.window.flag_predictions()
+        r = self.rect()
+        xc = (r.left() + r.width() * 0.5) * self.inv_w
+        yc = (r.top() + r.height() * 0.5) * self.inv_h
+        w = r.width() * self.inv_w
+        h = r.height() * self.inv_h
+        # The numeric tuple is the primary representation; the string is
+        # (re)materialized here once per gesture for the save path.
+        self.state["_parsed"] = (self.cls_id, xc, yc, w, h)
+        self.state["line"] = _YOLO_LINE_FMT % (self.cls_id, xc, yc, w, h)
+        self._update_children(r)
 
     # ------------------------------------------------------------------
     # Mouse events
@@ -152,7 +325,8 @@ class PredBox(QGraphicsRectItem):
         self._update_icon()
         if self.window.final_checkbox.isChecked():
             self.window.update_final_items()
-        self.window.flag_predictions()
+        # Acceptance feeds the final overlay and the save path only;
+        # GT matching does not depend on it, so no re-flag is needed.
 
     def mousePressEvent(self, event) -> None:  # type: ignore[override]
         """Toggle acceptance or start resizing on left click."""
@@ -161,6 +335,11 @@ class PredBox(QGraphicsRectItem):
             event.ignore()
             return
         if self._start_resize(event):
+            # Suppress BSP re-indexing for the duration of the drag; the
+            # scene re-indexes once when the index method is restored.
+            self.scene().setItemIndexMethod(
+                QGraphicsScene.ItemIndexMethod.NoIndex
+            )
             QGraphicsRectItem.mousePressEvent(self, event)
             return
         # Toggle accepted state when clicked.
@@ -176,6 +355,16 @@ class PredBox(QGraphicsRectItem):
     def mouseReleaseEvent(self, event) -> None:  # type: ignore[override]
         if self._resizing:
             self._resize(event)
+            self.scene().setItemIndexMethod(
+                getattr(
+                    self.window,
+                    "scene_index_method",
+                    QGraphicsScene.ItemIndexMethod.BspTreeIndex,
+                )
+            )
+            # Serialize the final geometry and refresh the overlay once.
+            self._update_from_rect()
+            self.window.refresh_annotations()
         self._resizing = None
         super().mouseReleaseEvent(event)
 
@@ -196,38 +385,131 @@ class GTBox(QGraphicsRectItem):
     ) -> None:
         super().__init__(rect)
         self.window = window
-        self.state = state
-        self.line = state["line"]
-        self.kept = state.get("kept", True)
-        self.setPen(QPen(QColor("green"), 2))
-        self.img_w = img_w
-        self.img_h = img_h
+        self.class_names = class_names
+        self.setPen(_GT_PEN)
+        # Device-coordinate cache, mirroring PredBox.
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self._resizing: Optional[str] = None
 
-        cls_id = int(self.line.split()[0])
-        cls_name = class_names[cls_id] if 0 <= cls_id < len(class_names) else str(cls_id)
-        self.label = QGraphicsTextItem(self)
-        self.label.setHtml(f"<div style='background-color:white;'>{cls_name}</div>")
-        self.label.setPos(rect.left(), rect.top() - 20)
+        # Lazily-built icon child, mirroring PredBox.
+        self.children_group: Optional[QGraphicsRectItem] = None
+        self._icon: Optional[ToggleIcon] = None
+        self._label_width = 0.0
 
+        self.rebind(rect, state, img_w, img_h)
+
+    @property
+    def icon(self) -> ToggleIcon:
+        """The clickable +/- indicator, created on first access."""
+
+        self._ensure_children()
+        return self._icon
+
+    def _ensure_children(self) -> None:
+        if self._icon is not None:
+            return
+        r = self.rect()
+        # Invisible child anchor at the top-left, mirroring PredBox.
+        self.children_group = QGraphicsRectItem(QRectF(), self)
+        self.children_group.setPen(_NO_PEN)
+        self.children_group.setPos(r.left(), r.top())
         # Clickable indicator mirroring the behaviour of PredBox
-        self.icon = ToggleIcon(self, self._toggle)
+        self._icon = ToggleIcon(self.children_group, self._toggle)
+        self._icon_offset_h = r.height()
+        self._icon.setPos(0, r.height() + 2)
         self._update_icon()
-        # Position the indicator at the bottom-left to mirror the predicted boxes.
-        self.icon.setPos(rect.left(), rect.bottom() + 2)
+
+    def rebind(
+        self, rect: QRectF, state: dict, img_w: int, img_h: int
+    ) -> None:
+        """Point this item at a new state dict and geometry in place."""
+
+        self.setRect(rect)
+        self.state = state
+        self.kept = state.get("kept", True)
+        # Only the reciprocals are kept; the serialization path
+        # multiplies, and two fewer attributes per box adds up on
+        # crowded images.
+        self.inv_w = 1.0 / img_w
+        self.inv_h = 1.0 / img_h
+        self._resizing = None
+
+        # Reuse the window's cached parse, mirroring PredBox.
+        parsed = state.get("_parsed")
+        self.cls_id = (
+            parsed[0]
+            if parsed is not None
+            else int(state["line"].split(maxsplit=1)[0])
+        )
+        cls_name = (
+            self.class_names[self.cls_id]
+            if 0 <= self.cls_id < len(self.class_names)
+            else str(self.cls_id)
+        )
+        self.label_text = cls_name
+        self._update_label_width()
+        if self._icon is not None:
+            self.children_group.setPos(rect.left(), rect.top())
+            self._update_icon()
+            # The indicator sits at the bottom-left, mirroring PredBox.
+            self._icon_offset_h = rect.height()
+            self._icon.setPos(0, rect.height() + 2)
+
+
+    # Extra headroom in the bounding rect for the label painted above the box.
+    LABEL_MARGIN = 24
+
+    def _update_label_width(self) -> None:
+        """Track the painted label width for :meth:`boundingRect`."""
+
+        width = _label_width(self.label_text)
+        if width != self._label_width:
+            self.prepareGeometryChange()
+            self._label_width = width
+
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        r = super().boundingRect().adjusted(0, -self.LABEL_MARGIN, 0, 0)
+        # The label backdrop starts at the box's left edge and may be
+        # wider than the box; without the extension both repainting and
+        # the device-coordinate cache clip it at the box edge.
+        needed = self.rect().left() + self._label_width
+        if needed > r.right():
+            r.setRight(needed)
+        return r
+
+    def paint(self, painter, option, widget=None) -> None:  # type: ignore[override]
+        """Draw the rectangle and its label in one pass.
+
+        Painting the label here avoids a ``QGraphicsTextItem`` child per
+        box, whose QTextDocument construction dominates scene build time
+        on crowded images.
+        """
+
+        self._ensure_children()
+        super().paint(painter, option, widget)
+        r = self.rect()
+        fm = painter.fontMetrics()
+        bg = QRectF(
+            r.left(),
+            r.top() - fm.height() - 4,
+            fm.horizontalAdvance(self.label_text) + 4,
+            fm.height() + 2,
+        )
+        painter.fillRect(bg, _LABEL_BG)
+        painter.setPen(_LABEL_FG)
+        painter.drawText(QPointF(r.left() + 2, r.top() - 7), self.label_text)
 
     def _update_icon(self) -> None:
         """Display a '-' to remove or a '+' to add the annotation."""
 
-        if self.kept:
-            symbol = "-"
-            color = "red"
-        else:
-            symbol = "+"
-            color = "green"
-        self.icon.setHtml(
-            f"<div style='color:{color};background-color:white;'>{symbol}</div>"
-        )
+        if self._icon is None:
+            return
+        symbol = "-" if self.kept else "+"
+        if symbol != self._icon.text():
+            self._icon.setText(symbol)
+            self._icon.setBrush(
+                _ICON_REMOVE_BRUSH if self.kept else _ICON_ADD_BRUSH
+            )
 
     # ------------------------------------------------------------------
     # Resizing helpers
@@ -253,17 +535,31 @@ class GTBox(QGraphicsRectItem):
         elif self._resizing == "bottomright":
             r.setBottomRight(pos)
         self.setRect(r)
-        self._update_from_rect()
+        # Geometry-only update while the drag is live; serializing the
+        # YOLO line and re-flagging predictions wait for mouse release.
+        self._update_children(r)
+
+    def _update_children(self, r: QRectF) -> None:
+        if self._icon is None:
+            return
+        # One anchor move covers the icon; it only needs its own update
+        # when the rectangle's height changed.
+        self.children_group.setPos(r.left(), r.top())
+        if r.height() != self._icon_offset_h:
+            self._icon_offset_h = r.height()
+            self._icon.setPos(0, r.height() + 2)
 
     def _update_from_rect(self) -> None:
-        cls_id = int(self.line.split()[0])
-        self.line = rect_to_yolo_line(self.rect(), cls_id, self.img_w, self.img_h)
-        self.state["line"] = self.line
-        self.label.setPos(self.rect().left(), self.rect().top() - 20)
-        self.icon.setPos(self.rect().left(), self.rect().bottom() + 2)
-        if self.window.final_checkbox.isChecked():
-            self.window.update_final_items()
-        self.window.flag_predictions()
+        r = self.rect()
+        xc = (r.left() + r.width() * 0.5) * self.inv_w
+        yc = (r.top() + r.height() * 0.5) * self.inv_h
+        w = r.width() * self.inv_w
+        h = r.height() * self.inv_h
+        # The numeric tuple is the primary representation; the string is
+        # (re)materialized here once per gesture for the save path.
+        self.state["_parsed"] = (self.cls_id, xc, yc, w, h)
+        self.state["line"] = _YOLO_LINE_FMT % (self.cls_id, xc, yc, w, h)
+        self._update_children(r)
 
     # ------------------------------------------------------------------
     # Mouse events
@@ -276,7 +572,9 @@ class GTBox(QGraphicsRectItem):
         self._update_icon()
         if self.window.final_checkbox.isChecked():
             self.window.update_final_items()
-        self.window.flag_predictions()
+        # One toggle only perturbs the predictions matched to this box;
+        # the window patches those instead of re-matching everything.
+        self.window.flag_gt_toggled(self.state)
 
     def mousePressEvent(self, event) -> None:  # type: ignore[override]
         """Toggle whether the ground truth annotation is kept on left click."""
@@ -285,6 +583,11 @@ class GTBox(QGraphicsRectItem):
             event.ignore()
             return
         if self._start_resize(event):
+            # Suppress BSP re-indexing for the duration of the drag; the
+            # scene re-indexes once when the index method is restored.
+            self.scene().setItemIndexMethod(
+                QGraphicsScene.ItemIndexMethod.NoIndex
+            )
             QGraphicsRectItem.mousePressEvent(self, event)
             return
         self._toggle()
@@ -299,6 +602,16 @@ class GTBox(QGraphicsRectItem):
     def mouseReleaseEvent(self, event) -> None:  # type: ignore[override]
         if self._resizing:
             self._resize(event)
+            self.scene().setItemIndexMethod(
+                getattr(
+                    self.window,
+                    "scene_index_method",
+                    QGraphicsScene.ItemIndexMethod.BspTreeIndex,
+                )
+            )
+            # Serialize the final geometry and refresh the overlay once.
+            self._update_from_rect()
+            self.window.refresh_annotations()
         self._resizing = None
         super().mouseReleaseEvent(event)
 
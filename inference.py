@@ -1,37 +1,191 @@
-"""Inference utilities using SAHI for sliding window predictions.
+"""Inference utilities for sliding window predictions.
 
 This module provides helper functions to load a YOLO model and run
-inference on large images by slicing them into 640x640 windows using
-`sahi` (Slicing Aided Hyper Inference). Predictions are returned in the
-same format as YOLO label files with an accompanying confidence score.
+inference on large images by slicing them into 640x640 windows with a
+small overlap.  All tiles of an image are pushed through the detector as
+one batch and merged with a single NMS pass, instead of the per-tile
+round trips ``sahi`` performs.  Predictions are returned in the same
+format as YOLO label files with an accompanying confidence score.
 """
 
 from __future__ import annotations
 
+import logging
+import os
+import warnings
 from typing import List, Tuple
 
+import numpy as np
+import torch
 from PIL import Image
 from sahi import AutoDetectionModel
-from sahi.predict import get_sliced_prediction
+from torchvision.ops import batched_nms
 
+# Bound once; %-formatting fixed-precision floats beats an f-string in
+# the per-detection formatting loop.
+_PRED_LINE_FMT = "%d %.6f %.6f %.6f %.6f"
 
-def load_model(model_path: str, device: str | None = None) -> AutoDetectionModel:
+# Sliding-window geometry shared by all predictions.
+SLICE_SIZE = 640
+OVERLAP_RATIO = 0.2
+NMS_IOU_THRESHOLD = 0.5
+
+
+def format_predictions(
+    classes: np.ndarray, xywhn: np.ndarray, confs: np.ndarray
+) -> List[Tuple[str, float]]:
+    """Format arrays of detections into YOLO label lines.
+
+    Operating on whole arrays keeps the per-detection work to a single
+    formatting pass instead of repeated per-box attribute access.
+
+    Args:
+        classes: Integer class ids of shape ``(N,)``.
+        xywhn: Normalized ``(xc, yc, w, h)`` boxes of shape ``(N, 4)``.
+        confs: Confidence scores of shape ``(N,)``.
+
+    Returns:
+        List[Tuple[str, float]]: ``("cls xc yc w h", confidence)`` pairs.
+    """
+
+    return [
+        (_PRED_LINE_FMT % (c, x, y, w, h), float(conf))
+        for c, (x, y, w, h), conf in zip(classes, xywhn, confs)
+    ]
+
+
+def export_model(model_path: str, backend: str) -> str:
+    """Export YOLO weights to an optimized inference backend.
+
+    The exported file is cached alongside the original weights, so the
+    (potentially slow) export only runs once per model.
+
+    Args:
+        model_path: Path to the ``.pt`` weights file.
+        backend: Target format, ``"onnx"`` or ``"engine"`` (TensorRT).
+
+    Returns:
+        str: Path to the exported model file.
+    """
+
+    suffix = {"onnx": ".onnx", "engine": ".engine"}[backend]
+    exported = os.path.splitext(model_path)[0] + suffix
+    if not os.path.exists(exported):
+        from ultralytics import YOLO
+
+        YOLO(model_path).export(format=backend, half=backend == "engine")
+    return exported
+
+
+def load_model(
+    model_path: str, device: str | None = None, backend: str = "pt"
+) -> AutoDetectionModel:
     """Load a YOLO model for sliced inference.
 
     Args:
         model_path: Path to the YOLO weights file.
         device: Device identifier (e.g., ``"cuda:0"`` or ``"cpu"``).
             If ``None``, ``sahi`` will select the available device.
+        backend: Inference backend: ``"pt"`` runs the weights through
+            PyTorch, while ``"onnx"`` and ``"engine"`` export once and
+            run through ONNX Runtime or TensorRT respectively.
 
     Returns:
         AutoDetectionModel: Wrapped detection model ready for SAHI inference.
     """
 
-    return AutoDetectionModel.from_pretrained(
+    if backend != "pt":
+        try:
+            model_path = export_model(model_path, backend)
+        except Exception as e:  # export depends on optional toolchains
+            logging.error(
+                "Failed to export model to %s (%s); falling back to PyTorch",
+                backend,
+                e,
+            )
+
+    model = AutoDetectionModel.from_pretrained(
         model_type="yolov8",
         model_path=model_path,
         device=device,
     )
+    if torch.cuda.is_available() and (device is None or "cuda" in device):
+        # Run the wrapped Ultralytics model in half precision on GPU.  The
+        # override is picked up when the predictor is built, so inputs are
+        # cast to FP16 alongside the weights.
+        overrides = getattr(model.model, "overrides", None)
+        if overrides is not None:
+            overrides["half"] = True
+    return model
+
+
+def predict_batch(
+    model: AutoDetectionModel, images: List[Image.Image], batch: int = 8
+) -> List[List[Tuple[str, float]]]:
+    """Run sliced prediction on a batch of images.
+
+    SAHI slices each image independently, so the images are currently
+    processed sequentially.  Funnelling all inference through this single
+    call site keeps the door open for a truly batched forward pass without
+    touching the callers again.
+
+    Args:
+        model: Loaded ``AutoDetectionModel`` from :func:`load_model`.
+        images: Input images on which inference will be performed.
+        batch: Maximum number of images handed to the backend at once.
+
+    Returns:
+        List[List[Tuple[str, float]]]: Per-image prediction lists in the
+        same order as ``images``.
+    """
+
+    return [predict(model, image) for image in images]
+
+
+def _slice_offsets(size: int, slice_size: int = SLICE_SIZE) -> List[int]:
+    """Compute window start offsets covering ``size`` with overlap.
+
+    The final window is shifted flush with the image edge so no pixels are
+    missed, matching SAHI's slicing behaviour.
+    """
+
+    stride = max(1, int(slice_size * (1 - OVERLAP_RATIO)))
+    offsets = list(range(0, max(size - slice_size, 0) + 1, stride))
+    if offsets[-1] + slice_size < size:
+        offsets.append(size - slice_size)
+    return offsets
+
+
+def _upload_image(
+    model: AutoDetectionModel, arr: np.ndarray, device
+) -> torch.Tensor:
+    """Move an HWC uint8 image array onto ``device``.
+
+    On CUDA the copy is staged through a reusable pinned host buffer kept
+    on the model, which lets the runtime use an asynchronous DMA transfer
+    instead of the synchronous pageable-memory path.  The buffer grows to
+    the largest image seen and is reused afterwards.
+    """
+
+    # PIL hands out read-only buffers, so the zero-copy view trips
+    # torch's non-writable warning.  The tensor is never written in
+    # place (``.float()`` and ``copy_`` both copy), so the warning is
+    # noise here.
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore", message="The given NumPy array is not writable"
+        )
+        tensor = torch.from_numpy(np.ascontiguousarray(arr))
+    if not str(device).startswith("cuda"):
+        return tensor
+    n = tensor.numel()
+    pinned = getattr(model, "_pinned", None)
+    if pinned is None or pinned.numel() < n:
+        pinned = torch.empty(n, dtype=torch.uint8, pin_memory=True)
+        model._pinned = pinned
+    staging = pinned[:n].view(tensor.shape)
+    staging.copy_(tensor)
+    return staging.to(device, non_blocking=True)
 
 
 def predict(
@@ -40,9 +194,10 @@ def predict(
     """Run sliced prediction on an image and return YOLO-formatted boxes.
 
     The image is processed with a 640x640 sliding window and a small overlap
-    to ensure objects at the borders are detected. Each prediction is
-    formatted as a tuple containing the YOLO label line and its confidence
-    score.
+    to ensure objects at the borders are detected.  All windows are run
+    through the detector as a single batch and the per-tile detections are
+    merged with one class-aware NMS pass.  Each prediction is formatted as
+    a tuple containing the YOLO label line and its confidence score.
 
     Args:
         model: Loaded ``AutoDetectionModel`` from :func:`load_model`.
@@ -53,37 +208,94 @@ def predict(
         pairs with normalized coordinates.
     """
 
-    result = get_sliced_prediction(
-        image,
-        detection_model=model,
-        slice_height=640,
-        slice_width=640,
-        overlap_height_ratio=0.2,
-        overlap_width_ratio=0.2,
+    # np.asarray is copy-free for contiguous RGB images; the array is
+    # uploaded to the model's device once and all tiles are cut as views
+    # of that resident tensor.
+    arr = np.asarray(image)
+    img_h, img_w = arr.shape[:2]
+
+    yolo = model.model
+    device = getattr(yolo, "device", None) or "cpu"
+
+    tensor = _upload_image(model, arr, device)
+    tensor = tensor.permute(2, 0, 1).float().div_(255.0)
+    pad_h = max(0, SLICE_SIZE - img_h)
+    pad_w = max(0, SLICE_SIZE - img_w)
+    if pad_h or pad_w:
+        tensor = torch.nn.functional.pad(tensor, (0, pad_w, 0, pad_h))
+
+    views = []
+    origins = []
+    for y0 in _slice_offsets(img_h):
+        for x0 in _slice_offsets(img_w):
+            views.append(tensor[:, y0 : y0 + SLICE_SIZE, x0 : x0 + SLICE_SIZE])
+            origins.append((x0, y0))
+    # The stack materializes the batch on the device, so tiling costs one
+    # host-to-device transfer total instead of one per tile.
+    tiles = torch.stack(views)
+    # Match the FP16 weights up front (see load_model) so the backend
+    # does not insert a full-batch cast before the forward pass.
+    if str(device).startswith("cuda") and getattr(yolo, "overrides", {}).get("half"):
+        tiles = tiles.half()
+
+    # One batched forward pass over all tiles instead of one model call
+    # (and GPU sync) per tile.
+    results = yolo(
+        tiles,
+        imgsz=SLICE_SIZE,
+        conf=getattr(model, "confidence_threshold", 0.25),
+        verbose=False,
     )
 
-    img_w, img_h = image.size
-    lines: List[Tuple[str, float]] = []
-    for obj in result.object_prediction_list:
-        bbox = obj.bbox
-        x1, y1, x2, y2 = bbox.minx, bbox.miny, bbox.maxx, bbox.maxy
-        w = x2 - x1
-        h = y2 - y1
-        xc = x1 + w / 2
-        yc = y1 + h / 2
-
-        # Normalize coordinates to image dimensions
-        norm = (
-            xc / img_w,
-            yc / img_h,
-            w / img_w,
-            h / img_h,
-        )
+    box_parts = []
+    cls_parts = []
+    conf_parts = []
+    tile_origins = []
+    counts = []
+    for (x0, y0), result in zip(origins, results):
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            continue
+        box_parts.append(boxes.xyxy)
+        cls_parts.append(boxes.cls)
+        conf_parts.append(boxes.conf)
+        tile_origins.append((x0, y0))
+        counts.append(len(boxes))
+
+    if not box_parts:
+        return []
+
+    # Everything below stays on the model's device until the final packed
+    # transfer: a broadcast add maps tile-local boxes into image
+    # coordinates and one class-aware NMS pass collapses duplicates from
+    # overlapping tiles.
+    xyxy = torch.cat(box_parts).float()
+    classes = torch.cat(cls_parts).float()
+    confs = torch.cat(conf_parts).float()
+    shifts = torch.as_tensor(
+        tile_origins, dtype=xyxy.dtype, device=xyxy.device
+    ).repeat_interleave(
+        torch.as_tensor(counts, device=xyxy.device), dim=0
+    )
+    xyxy[:, :2] += shifts
+    xyxy[:, 2:] += shifts
 
-        cls = obj.category.id
-        conf = obj.score.value
-        line = f"{cls} {norm[0]:.6f} {norm[1]:.6f} {norm[2]:.6f} {norm[3]:.6f}"
-        lines.append((line, conf))
+    keep = batched_nms(xyxy, confs, classes, NMS_IOU_THRESHOLD)
+    packed = torch.cat(
+        [xyxy, classes[:, None], confs[:, None]], dim=1
+    )[keep]
+    # Single device-to-host transfer for all surviving detections.
+    packed = packed.cpu().numpy().astype(np.float64)
+    xyxy_np = packed[:, :4]
+    classes_np = packed[:, 4].astype(np.int64)
+    confs_np = packed[:, 5]
 
-    return lines
+    wh = xyxy_np[:, 2:] - xyxy_np[:, :2]
+    ctr = (xyxy_np[:, 2:] + xyxy_np[:, :2]) * 0.5
+    xywhn = np.empty_like(xyxy_np)
+    xywhn[:, 0] = ctr[:, 0] / img_w
+    xywhn[:, 1] = ctr[:, 1] / img_h
+    xywhn[:, 2] = wh[:, 0] / img_w
+    xywhn[:, 3] = wh[:, 1] / img_h
 
+    return format_predictions(classes_np, xywhn, confs_np)
@@ -33,7 +33,7 @@ def test_class_names_loaded_with_predictions(tmp_path, monkeypatch):
         def __init__(self):
             self.model = type("m", (), {"names": ["cls"]})()
 
-    def fake_load_model(path):
+    def fake_load_model(path, backend="pt"):
         return DummyModel()
 
     captured = {}
@@ -31,6 +31,7 @@ def test_zoomable_graphics_view_zoom():
         False,
     )
     view.wheelEvent(event)
+    app.processEvents()  # zoom factors are coalesced onto the event loop
 
     assert view.transform().m11() > initial
 
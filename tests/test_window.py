@@ -4,10 +4,11 @@ import sys
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 sys.path.append(os.getcwd())
 
+import numpy as np
 from PIL import Image
 from PyQt6.QtCore import Qt
 from PyQt6.QtTest import QTest
-from PyQt6.QtWidgets import QApplication, QGraphicsTextItem
+from PyQt6.QtWidgets import QApplication, QGraphicsSimpleTextItem
 import pytest
 
 from window import AnnotationWindow
@@ -42,9 +43,9 @@ def test_final_items_show_classes(tmp_path):
     window.final_checkbox.setChecked(True)
     window.update_final_items()
     texts = [
-        item.toPlainText()
+        item.text()
         for item in window.final_items
-        if isinstance(item, QGraphicsTextItem)
+        if isinstance(item, QGraphicsSimpleTextItem)
     ]
     assert "obj" in texts
 
@@ -95,3 +96,62 @@ def test_arrow_keys_navigate_after_control_interaction(tmp_path):
     QTest.keyClick(window, Qt.Key.Key_Left)
     assert window.index == 0
 
+
+
+def test_pil_to_pixmap_handles_unaligned_width(tmp_path):
+    """Odd widths need the explicit stride; rows are tightly packed."""
+
+    app = QApplication.instance() or QApplication([])
+    img = Image.new("RGB", (13, 7))
+    window = AnnotationWindow(
+        [img], [[]], [[]], [str(tmp_path / "labels.txt")], ["obj"]
+    )
+    pixmap = window.pil_to_pixmap(np.asarray(img))
+    assert (pixmap.width(), pixmap.height()) == (13, 7)
+
+
+def test_iou_matrix_matches_known_values():
+    """The broadcasted matrix must agree with hand-computed IoUs."""
+
+    from window import iou_matrix
+
+    boxes1 = np.array([[0.0, 0.0, 10.0, 10.0], [20.0, 20.0, 10.0, 10.0]])
+    boxes2 = np.array([[0.0, 0.0, 10.0, 10.0], [5.0, 0.0, 10.0, 10.0]])
+    ious = iou_matrix(boxes1, boxes2)
+    assert ious.shape == (2, 2)
+    assert ious[0, 0] == pytest.approx(1.0)
+    assert ious[0, 1] == pytest.approx(50.0 / 150.0)
+    assert ious[1, 0] == 0.0
+    assert ious[1, 1] == 0.0
+
+
+def test_xywhn_to_rects_scales_to_pixels():
+    """Normalized centers/sizes must map to top-left + size in pixels."""
+
+    from window import xywhn_to_rects
+
+    xywhn = np.array([[0.5, 0.5, 0.2, 0.2], [0.1, 0.2, 0.1, 0.4]])
+    rects = xywhn_to_rects(xywhn, 100, 50)
+    assert rects[0] == pytest.approx([40.0, 20.0, 20.0, 10.0])
+    assert rects[1] == pytest.approx([5.0, 0.0, 10.0, 20.0])
+
+
+def test_save_all_writes_kept_and_accepted_lines(tmp_path):
+    """Saving must emit kept GT lines plus accepted predictions, once each."""
+
+    from PIL import Image as PILImage
+
+    app = QApplication.instance() or QApplication([])
+    img = PILImage.new("RGB", (10, 10))
+    preds = [[{"line": "1 0.2 0.2 0.1 0.1", "conf": 0.9, "accepted": True}]]
+    gts = [
+        [
+            {"line": "0 0.5 0.5 0.2 0.2", "kept": True},
+            {"line": "0 0.8 0.8 0.1 0.1", "kept": False},
+        ]
+    ]
+    label_file = tmp_path / "sub" / "labels.txt"
+    window = AnnotationWindow([img], preds, gts, [str(label_file)], ["a", "b"])
+    window.save_all()
+    window.save_all()  # repeat saves reuse the cached directory set
+    assert label_file.read_text() == "0 0.5 0.5 0.2 0.2\n1 0.2 0.2 0.1 0.1\n"
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtCore import QPoint, Qt, QTimer
 from PyQt6.QtGui import QWheelEvent
 from PyQt6.QtWidgets import QGraphicsView
 
@@ -36,14 +36,49 @@ class ZoomableGraphicsView(QGraphicsView):
         )
         # Disable the context menu so right-click can be used for panning.
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.PreventContextMenu)
+        # Repaint only the regions that actually changed instead of the
+        # whole viewport on every pan/zoom step.
+        self.setViewportUpdateMode(
+            QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+        )
+        # Items manage their own pen/brush state and the 2px box pens are
+        # drawn unaliased, so skip both the per-item painter save/restore
+        # and the 2px boundingRect expansion Qt otherwise applies to every
+        # visible item for antialiasing clip calculations.
+        self.setOptimizationFlags(
+            QGraphicsView.OptimizationFlag.DontSavePainterState
+            | QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+        )
+        # The background pixmap rarely changes; cache its rasterization
+        # so panning does not redraw it from scratch.
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+        # Accumulated zoom factor applied once per event-loop tick;
+        # kinetic scrolling can deliver many wheel events per frame.
+        self._pending_zoom = 1.0
+        self._zoom_scheduled = False
 
     def wheelEvent(self, event: QWheelEvent) -> None:  # type: ignore[override]
-        """Scale the view matrix in response to a wheel event."""
+        """Scale the view matrix in response to a wheel event.
+
+        Wheel ticks arriving in a burst are multiplied into one pending
+        factor and applied on the next event-loop pass, so a fast scroll
+        costs one repaint per tick of the loop rather than per event.
+        """
 
         # Positive delta values indicate that the wheel was rotated away from
         # the user (zoom in); negative values mean zoom out.
         factor = 1.25 if event.angleDelta().y() > 0 else 0.8
-        self.scale(factor, factor)
+        self._pending_zoom *= factor
+        if not self._zoom_scheduled:
+            self._zoom_scheduled = True
+            QTimer.singleShot(0, self._apply_zoom)
+
+    def _apply_zoom(self) -> None:
+        self._zoom_scheduled = False
+        factor = self._pending_zoom
+        self._pending_zoom = 1.0
+        if factor != 1.0:
+            self.scale(factor, factor)
 
     def mousePressEvent(self, event):  # type: ignore[override]
         if event.button() == Qt.MouseButton.RightButton:
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import io
 import os
-from typing import List
-
-from PIL import ImageEnhance
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QColor, QImage, QPixmap, QPen
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+from PIL import Image
+from PyQt6.QtCore import Qt, QRectF, QRunnable, QThreadPool, QTimer
+from PyQt6.QtGui import QBrush, QColor, QImage, QPixmap, QPen
 from PyQt6.QtWidgets import (
     QApplication,
     QCheckBox,
@@ -15,7 +19,7 @@ from PyQt6.QtWidgets import (
     QGraphicsPixmapItem,
     QGraphicsRectItem,
     QGraphicsScene,
-    QGraphicsTextItem,
+    QGraphicsSimpleTextItem,
     QHBoxLayout,
     QLabel,
     QMainWindow,
@@ -26,9 +30,196 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+try:  # pragma: no cover - optional accelerator
+    from numba import njit, prange
+except ImportError:  # numba is optional; NumPy handles the same math
+    njit = None
+
 from graphics_items import GTBox, PredBox
+from preprocessing import preprocess
 from view_utils import ZoomableGraphicsView
 
+# Number of decoded images kept in memory when lazy-loading from paths.
+IMAGE_CACHE_SIZE = 8
+
+# Number of rendered background pixmaps kept per (image, brightness,
+# contrast) combination.  Deliberately small: pixmaps are full-frame
+# ARGB, so a handful of entries already covers slider reversals and
+# back-and-forth navigation without unbounded growth.
+PIXMAP_CACHE_SIZE = 8
+
+# Pens applied by flag_predictions.  setPen copies its argument, so two
+# shared instances replace a fresh QPen + color-name parse per box per
+# refresh.
+_MATCHED_PEN = QPen(QColor("red"), 2)
+_UNMATCHED_PEN = QPen(QColor(255, 191, 0), 2)
+
+# Shared styling for the final overlay and its class labels.
+_FINAL_RECT_PEN = QPen(QColor("blue"), 2)
+_FINAL_TEXT_BRUSH = QBrush(QColor("blue"))
+_FINAL_BG_BRUSH = QBrush(QColor("white"))
+_FINAL_NO_PEN = QPen(Qt.PenStyle.NoPen)
+
+
+class _PreloadTask(QRunnable):
+    """Decode one image on a worker thread into the window's LRU cache.
+
+    Decoding touches only PIL/NumPy objects, so it is safe off the GUI
+    thread; the single dict assignment publishing the result is atomic
+    under the GIL.
+    """
+
+    def __init__(self, window: "AnnotationWindow", index: int) -> None:
+        super().__init__()
+        self.window = window
+        self.index = index
+
+    def run(self) -> None:  # noqa: D102 - QRunnable interface
+        cache = self.window._image_cache
+        entry = self.window.images[self.index]
+        if self.index in cache or not isinstance(entry, str):
+            return
+        image = Image.open(entry)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        cache[self.index] = preprocess(image)
+
+
+class _FinalOverlay(QGraphicsItem):
+    """Single graphics item painting every final (blue) rectangle.
+
+    Drawing all rectangles inside one ``paint`` call costs one virtual
+    dispatch and one painter state per repaint instead of one per box.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._rects: List[QRectF] = []
+        self._bounds = QRectF()
+
+    def set_rects(self, rects: List[QRectF]) -> None:
+        """Replace the painted rectangles and refresh the bounds."""
+
+        self.prepareGeometryChange()
+        self._rects = rects
+        bounds = QRectF()
+        for r in rects:
+            bounds = bounds.united(r)
+        self._bounds = bounds.adjusted(-2.0, -2.0, 2.0, 2.0)
+
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        return self._bounds
+
+    def paint(self, painter, option, widget=None) -> None:  # type: ignore[override]
+        painter.setPen(_FINAL_RECT_PEN)
+        painter.drawRects(self._rects)
+
+
+@lru_cache(maxsize=64)
+def _brightness_contrast_lut(b_int: int, c_int: int) -> np.ndarray:
+    """Build the fused brightness/contrast lookup table for slider values.
+
+    Both adjustments are pointwise affine maps on uint8, so they fuse
+    into one 256-entry table: O(256) float math regardless of
+    resolution, then a single gather pass over the pixels.  Slider
+    values are integers (0..200), so the table memoizes cleanly and
+    slider reversals skip even the O(256) rebuild.
+    """
+
+    b = b_int / 100.0
+    c = c_int / 100.0
+    return np.clip(
+        ((np.arange(256) - 128.0) * c + 128.0) * b, 0.0, 255.0
+    ).astype(np.uint8)
+
+
+def parse_states(states: List[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse the YOLO lines of box states into struct-of-arrays form.
+
+    The per-box dicts stay around as the mutable interaction state shared
+    with the graphics items, but the numeric fields are mirrored into
+    contiguous arrays so geometry work can run vectorized instead of
+    re-parsing strings per box.
+
+    Args:
+        states: Box state dicts containing a ``"line"`` key.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ``(cls, xywhn)`` arrays of shape
+        ``(N,)`` int32 and ``(N, 4)`` float64.
+    """
+
+    n = len(states)
+    cls = np.empty(n, dtype=np.int32)
+    xywhn = np.empty((n, 4), dtype=np.float64)
+    # States are parsed all-or-nothing (this function caches a tuple on
+    # every dict it sees, and boxes are never appended afterwards), so
+    # probing the first state is enough to detect a cold list.
+    if n and "_parsed" not in states[0]:
+        # Cold path on first load: parse every line in one pass instead
+        # of splitting and float()-ing per box — through the compiled
+        # scanner when numba is available, else one np.loadtxt call.
+        joined = "\n".join(state["line"] for state in states)
+        parsed = False
+        if njit is not None:
+            try:
+                buf = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+            except UnicodeEncodeError:
+                buf = None
+            if buf is not None and _parse_lines_jit(buf, cls, xywhn) == n:
+                parsed = True
+        if not parsed:
+            try:
+                arr = np.loadtxt(io.StringIO(joined), ndmin=2)
+            except ValueError:
+                arr = None
+            if arr is not None and arr.shape == (n, 5):
+                cls[:] = arr[:, 0]
+                xywhn[:] = arr[:, 1:]
+                parsed = True
+        if parsed:
+            for i, state in enumerate(states):
+                state["_parsed"] = (int(cls[i]),) + tuple(xywhn[i])
+            return cls, xywhn
+    for i, state in enumerate(states):
+        cached = state.get("_parsed")
+        if cached is not None:
+            cls[i] = cached[0]
+            xywhn[i] = cached[1:]
+            continue
+        parts = state["line"].split(maxsplit=4)
+        if len(parts) != 5:
+            cls[i] = 0
+            xywhn[i] = 0.0
+            state["_parsed"] = (0, 0.0, 0.0, 0.0, 0.0)
+            continue
+        cls[i] = int(parts[0])
+        xywhn[i] = [float(p) for p in parts[1:]]
+        # Cache the parsed tuple so navigation and the graphics items
+        # never re-split the same string.
+        state["_parsed"] = (int(cls[i]),) + tuple(xywhn[i])
+    return cls, xywhn
+
+
+def xywhn_to_rects(xywhn: np.ndarray, img_w: int, img_h: int) -> np.ndarray:
+    """Scale normalized ``(xc, yc, w, h)`` boxes to pixel ``(x1, y1, w, h)``.
+
+    Args:
+        xywhn: Normalized boxes of shape ``(N, 4)``.
+        img_w: Image width in pixels.
+        img_h: Image height in pixels.
+
+    Returns:
+        np.ndarray: Array of shape ``(N, 4)`` with top-left corner and size.
+    """
+
+    out = np.empty_like(xywhn)
+    out[:, 0] = (xywhn[:, 0] - xywhn[:, 2] * 0.5) * img_w
+    out[:, 1] = (xywhn[:, 1] - xywhn[:, 3] * 0.5) * img_h
+    out[:, 2] = xywhn[:, 2] * img_w
+    out[:, 3] = xywhn[:, 3] * img_h
+    return out
+
 
 def yolo_line_to_rect(line: str, img_w: int, img_h: int) -> QRectF:
     """Convert a YOLO label line to a ``QRectF``."""
@@ -43,21 +234,177 @@ def yolo_line_to_rect(line: str, img_w: int, img_h: int) -> QRectF:
     return QRectF(x1, y1, w * img_w, h * img_h)
 
 
-def iou(rect1: QRectF, rect2: QRectF) -> float:
-    """Compute intersection-over-union of two rectangles."""
+def iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
+    """Compute pairwise IoU between two sets of ``(x1, y1, w, h)`` boxes.
+
+    A single broadcasted min/max pass replaces per-pair ``QRectF``
+    intersections, so matching stays cheap even on dense scenes.
+
+    Args:
+        boxes1: Array of shape ``(N, 4)``.
+        boxes2: Array of shape ``(M, 4)``.
+
+    Returns:
+        np.ndarray: IoU matrix of shape ``(N, M)``.
+    """
+
+    if njit is not None:
+        return _iou_matrix_jit(
+            np.ascontiguousarray(boxes1), np.ascontiguousarray(boxes2)
+        )
+    x11, y11 = boxes1[:, 0:1], boxes1[:, 1:2]
+    x12, y12 = x11 + boxes1[:, 2:3], y11 + boxes1[:, 3:4]
+    x21, y21 = boxes2[:, 0], boxes2[:, 1]
+    x22, y22 = x21 + boxes2[:, 2], y21 + boxes2[:, 3]
+    iw = np.minimum(x12, x22) - np.maximum(x11, x21)
+    ih = np.minimum(y12, y22) - np.maximum(y11, y21)
+    inter = np.clip(iw, 0.0, None) * np.clip(ih, 0.0, None)
+    area1 = (boxes1[:, 2] * boxes1[:, 3])[:, None]
+    area2 = boxes2[:, 2] * boxes2[:, 3]
+    union = area1 + area2 - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _parse_lines_jit(buf, cls, xywhn):  # pragma: no cover - needs numba
+        """Compiled scanner behind :func:`parse_states`.
+
+        Parses newline-separated ``"cls xc yc w h"`` ASCII lines from a
+        uint8 buffer straight into the output arrays and returns the
+        number of complete rows parsed; the caller falls back to
+        np.loadtxt unless every expected row was produced.
+        """
+
+        n = cls.shape[0]
+        m = buf.shape[0]
+        i = 0
+        row = 0
+        while row < n and i < m:
+            for field in range(5):
+                while i < m and buf[i] == 32:  # space
+                    i += 1
+                sign = 1.0
+                if i < m and buf[i] == 45:  # '-'
+                    sign = -1.0
+                    i += 1
+                val = 0.0
+                digits = 0
+                while i < m and 48 <= buf[i] <= 57:
+                    val = val * 10.0 + (buf[i] - 48)
+                    digits += 1
+                    i += 1
+                if i < m and buf[i] == 46:  # '.'
+                    i += 1
+                    frac = 0.1
+                    while i < m and 48 <= buf[i] <= 57:
+                        val += (buf[i] - 48) * frac
+                        frac *= 0.1
+                        digits += 1
+                        i += 1
+                if digits == 0:
+                    # A field that consumed no digits means the line ran
+                    # short (e.g. "1 0.5"); report only the complete rows
+                    # so the caller takes the same fallback as np.loadtxt.
+                    return row
+                if i < m and (buf[i] == 101 or buf[i] == 69):  # e/E
+                    i += 1
+                    esign = -1 if i < m and buf[i] == 45 else 1
+                    if i < m and (buf[i] == 43 or buf[i] == 45):
+                        i += 1
+                    exp = 0
+                    while i < m and 48 <= buf[i] <= 57:
+                        exp = exp * 10 + (buf[i] - 48)
+                        i += 1
+                    val *= 10.0 ** (esign * exp)
+                val *= sign
+                if field == 0:
+                    cls[row] = int(val)
+                else:
+                    xywhn[row, field - 1] = val
+            # A well-formed line is fully consumed here; anything left
+            # before the newline means the input is malformed, so stop
+            # and let the caller fall back.
+            while i < m and buf[i] == 32:
+                i += 1
+            if i < m and buf[i] != 10:  # newline
+                return row
+            i += 1
+            row += 1
+        return row
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _iou_matrix_jit(boxes1, boxes2):  # pragma: no cover - needs numba
+        """Numba kernel behind :func:`iou_matrix`; same math, fused loops."""
+
+        n = boxes1.shape[0]
+        m = boxes2.shape[0]
+        out = np.empty((n, m))
+        for i in prange(n):
+            x11 = boxes1[i, 0]
+            y11 = boxes1[i, 1]
+            w1 = boxes1[i, 2]
+            h1 = boxes1[i, 3]
+            a1 = w1 * h1
+            for j in range(m):
+                iw = min(x11 + w1, boxes2[j, 0] + boxes2[j, 2]) - max(
+                    x11, boxes2[j, 0]
+                )
+                ih = min(y11 + h1, boxes2[j, 1] + boxes2[j, 3]) - max(
+                    y11, boxes2[j, 1]
+                )
+                inter = max(iw, 0.0) * max(ih, 0.0)
+                union = a1 + boxes2[j, 2] * boxes2[j, 3] - inter
+                out[i, j] = inter / union if union > 0.0 else 0.0
+        return out
+
 
-    inter = rect1.intersected(rect2)
-    if inter.isNull():
+def iou_xyxy(
+    ax1: float,
+    ay1: float,
+    ax2: float,
+    ay2: float,
+    bx1: float,
+    by1: float,
+    bx2: float,
+    by2: float,
+) -> float:
+    """Compute IoU of two ``(x1, y1, x2, y2)`` boxes with scalar math.
+
+    For a single pair, plain min/max arithmetic beats both the NumPy
+    kernel (array setup overhead) and ``QRectF.intersected`` (several
+    Python/C++ round trips per call).
+    """
+
+    iw = min(ax2, bx2) - max(ax1, bx1)
+    ih = min(ay2, by2) - max(ay1, by1)
+    if iw <= 0.0 or ih <= 0.0:
         return 0.0
-    inter_area = inter.width() * inter.height()
-    union_area = (
-        rect1.width() * rect1.height()
-        + rect2.width() * rect2.height()
-        - inter_area
+    inter = iw * ih
+    union = (ax2 - ax1) * (ay2 - ay1) + (bx2 - bx1) * (by2 - by1) - inter
+    return inter / union if union > 0.0 else 0.0
+
+
+def iou(rect1: QRectF, rect2: QRectF) -> float:
+    """Compute intersection-over-union of two rectangles.
+
+    Thin ``QRectF`` wrapper around :func:`iou_xyxy`; each rect is
+    unpacked exactly once instead of going through ``intersected``.
+    """
+
+    x1, y1 = rect1.left(), rect1.top()
+    x2, y2 = rect2.left(), rect2.top()
+    return iou_xyxy(
+        x1,
+        y1,
+        x1 + rect1.width(),
+        y1 + rect1.height(),
+        x2,
+        y2,
+        x2 + rect2.width(),
+        y2 + rect2.height(),
     )
-    if union_area == 0:
-        return 0.0
-    return inter_area / union_area
 
 
 class AnnotationWindow(QMainWindow):
@@ -75,20 +422,71 @@ class AnnotationWindow(QMainWindow):
         self.setWindowTitle("YOLO Annotation Corrector")
         self.class_names = class_names
         self.images = images
+        self._image_cache: OrderedDict = OrderedDict()
+        # Rendered backgrounds keyed by (index, brightness, contrast).
+        self._pixmap_cache: OrderedDict = OrderedDict()
+        # Parsed box arrays per image index, so revisiting a neighbour
+        # skips the per-box parse loops and rect scaling entirely;
+        # invalidated when a resize gesture changes geometry.
+        self._parse_cache: OrderedDict = OrderedDict()
+        # Single worker decoding neighbouring images ahead of navigation.
+        self._preload_pool = QThreadPool(self)
+        self._preload_pool.setMaxThreadCount(1)
+        # Persistent RGB/scratch buffers reused by adjust_image.
+        self._rgb_source = None
+        self._rgb = None
+        self._adj = None
+        # (index, brightness, contrast) behind the current background
+        # pixmap; repeated identical slider values become no-ops.
+        self._last_display_key = None
         self.pred_states = predictions
         self.gt_states = labels
         self.label_files = label_files
+        self._made_dirs: set = set()
+        # Body last written per label file; unchanged files are skipped
+        # on subsequent saves.
+        self._saved_bodies: dict = {}
         self.index = 0
 
         # Ensure the window can receive key events for navigation.
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
+        # Debounce timer shared by the brightness/contrast sliders.
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.setInterval(16)
+        self._display_timer.timeout.connect(self.update_image_display)
+
         self.scene = QGraphicsScene(self)
         self.view = ZoomableGraphicsView(self.scene)
 
+        # Aggregated painter for the blue final-label rectangles.
+        self._final_overlay = _FinalOverlay()
+        self._final_overlay.setZValue(1)
+        self._final_overlay.setVisible(False)
+        self.scene.addItem(self._final_overlay)
+
+        # Invisible layer parents for the box items.  The visibility
+        # checkboxes flip one flag on the parent instead of iterating
+        # every box; a plain rect item (not QGraphicsItemGroup) keeps
+        # mouse events flowing to the children.
+        self.pred_group = QGraphicsRectItem()
+        self.pred_group.setPen(QPen(Qt.PenStyle.NoPen))
+        self.scene.addItem(self.pred_group)
+        self.gt_group = QGraphicsRectItem()
+        self.gt_group.setPen(QPen(Qt.PenStyle.NoPen))
+        self.scene.addItem(self.gt_group)
+
         self.pred_items: List[PredBox] = []
         self.gt_items: List[GTBox] = []
         self.final_items: List[QGraphicsItem] = []
+        # Item pools reused across images; constructing Qt graphics items
+        # (pens, children, text documents) is far more expensive than
+        # rebinding existing ones.
+        self._pred_pool: List[PredBox] = []
+        self._gt_pool: List[GTBox] = []
+        self._final_pool: List[QGraphicsSimpleTextItem] = []
+        self.background_item = None
 
         # Checkboxes controlling visibility of annotation layers
         self.pred_checkbox = QCheckBox("Show predictions")
@@ -132,13 +530,13 @@ class AnnotationWindow(QMainWindow):
         self.brightness_slider.setRange(0, 200)
         self.brightness_slider.setValue(100)
         self.brightness_slider.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.brightness_slider.valueChanged.connect(self.update_image_display)
+        self.brightness_slider.valueChanged.connect(self.schedule_display_update)
 
         self.contrast_slider = QSlider(Qt.Orientation.Horizontal)
         self.contrast_slider.setRange(0, 200)
         self.contrast_slider.setValue(100)
         self.contrast_slider.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.contrast_slider.valueChanged.connect(self.update_image_display)
+        self.contrast_slider.valueChanged.connect(self.schedule_display_update)
 
         control_layout = QHBoxLayout()
         control_layout.addWidget(self.pred_checkbox)
@@ -167,6 +565,12 @@ class AnnotationWindow(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        # Per-prediction best-match cache (global GT index and IoU)
+        # maintained by flag_predictions and patched incrementally when a
+        # single ground-truth box is toggled.
+        self._pred_best_gt = None
+        self._pred_best_iou = None
+
         self.load_image(0)
         # Ensure main window receives keyboard focus for arrow navigation
         self.setFocus()
@@ -174,25 +578,125 @@ class AnnotationWindow(QMainWindow):
     # ------------------------------------------------------------------
     # Image and box management
     # ------------------------------------------------------------------
-    def pil_to_pixmap(self, img):
-        """Convert a PIL image to ``QPixmap``."""
-
-        img = img.convert("RGB")
-        data = img.tobytes("raw", "RGB")
-        qimg = QImage(data, img.width, img.height, QImage.Format.Format_RGB888)
+    def get_image(self, index: int):
+        """Return the preprocessed PIL image at ``index``.
+
+        Entries in ``self.images`` may be PIL images or file paths.  Paths
+        are decoded and preprocessed on demand and kept in a small LRU
+        cache, so memory stays bounded no matter how many images need
+        review.
+        """
+
+        entry = self.images[index]
+        if not isinstance(entry, str):
+            return entry
+        cached = self._image_cache.get(index)
+        if cached is not None:
+            self._image_cache.move_to_end(index)
+            return cached
+        image = Image.open(entry)
+        if image.mode != "RGB":
+            # convert() copies even for a no-op conversion; only pay for
+            # it on images that actually need the mode change.
+            image = image.convert("RGB")
+        image = preprocess(image)
+        self._image_cache[index] = image
+        while len(self._image_cache) > IMAGE_CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+        return image
+
+    def preload_neighbors(self) -> None:
+        """Queue background decoding of the previous and next images.
+
+        Next/Previous clicks then find their image already decoded in the
+        cache instead of blocking the GUI thread on PIL for hundreds of
+        milliseconds on multi-megapixel files.
+        """
+
+        for i in (self.index + 1, self.index - 1):
+            if 0 <= i < len(self.images) and i not in self._image_cache:
+                if isinstance(self.images[i], str):
+                    self._preload_pool.start(_PreloadTask(self, i))
+
+    def pil_to_pixmap(self, arr: np.ndarray) -> QPixmap:
+        """Wrap a contiguous RGB ``uint8`` array in a ``QPixmap``.
+
+        The explicit stride lets QImage wrap the array's memory directly
+        instead of re-copying a ``tobytes`` buffer per conversion.
+        ``QPixmap.fromImage`` deep-copies the pixels, so the array only
+        has to outlive this call — no dangling reference needs to be
+        parked on the window.
+        """
+
+        h, w = arr.shape[:2]
+        qimg = QImage(arr.data, w, h, w * 3, QImage.Format.Format_RGB888)
+        # No NoFormatConversion here: that flag makes fromImage adopt the
+        # array's memory instead of copying, and every caller hands in a
+        # scratch buffer that adjust_image rewrites in place — cached
+        # pixmaps would alias (and outlive) it.  The conversion copy is
+        # what guarantees the pixmap owns its pixels.
         return QPixmap.fromImage(qimg)
 
-    def adjust_image(self, img):
-        """Apply brightness and contrast adjustments using current slider values."""
-
-        b = self.brightness_slider.value() / 100.0
-        c = self.contrast_slider.value() / 100.0
-        out = img
-        if b != 1.0:
-            out = ImageEnhance.Brightness(out).enhance(b)
-        if c != 1.0:
-            out = ImageEnhance.Contrast(out).enhance(c)
-        return out
+    def _warm_neighbor_pixmaps(self) -> None:
+        """Render already-decoded neighbour images into the pixmap cache.
+
+        Runs on the GUI thread (QPixmap cannot be touched elsewhere) but
+        only from an idle event-loop pass, and only for images the
+        preload worker has finished decoding — so it never blocks
+        interaction on PIL work.
+        """
+
+        b = self.brightness_slider.value()
+        c = self.contrast_slider.value()
+        for i in (self.index + 1, self.index - 1):
+            if not 0 <= i < len(self.images):
+                continue
+            decoded = (
+                not isinstance(self.images[i], str) or i in self._image_cache
+            )
+            if decoded and (i, b, c) not in self._pixmap_cache:
+                self._display_pixmap((i, b, c))
+
+    def _display_pixmap(self, key: Tuple[int, int, int]) -> QPixmap:
+        """Return the background pixmap for ``(index, brightness, contrast)``.
+
+        Hits in the small LRU make slider reversals and revisited images
+        free; misses render through :meth:`adjust_image` and evict the
+        oldest entry.
+        """
+
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is not None:
+            self._pixmap_cache.move_to_end(key)
+            return pixmap
+        img = self.get_image(key[0])
+        pixmap = self.pil_to_pixmap(self.adjust_image(img))
+        self._pixmap_cache[key] = pixmap
+        while len(self._pixmap_cache) > PIXMAP_CACHE_SIZE:
+            self._pixmap_cache.popitem(last=False)
+        return pixmap
+
+    def adjust_image(self, img) -> np.ndarray:
+        """Apply brightness and contrast adjustments using current slider values.
+
+        The PIL image is decoded into a persistent RGB buffer once per
+        image; slider changes then apply a fused brightness/contrast
+        lookup table into a preallocated output buffer instead of
+        allocating fresh ``ImageEnhance`` copies on every tick.
+        """
+
+        if self._rgb_source is not img:
+            rgb = img if img.mode == "RGB" else img.convert("RGB")
+            self._rgb = np.ascontiguousarray(np.asarray(rgb))
+            self._adj = np.empty_like(self._rgb)
+            self._rgb_source = img
+        b_int = self.brightness_slider.value()
+        c_int = self.contrast_slider.value()
+        if b_int == 100 and c_int == 100:
+            return self._rgb
+        lut = _brightness_contrast_lut(b_int, c_int)
+        np.take(lut, self._rgb, out=self._adj)
+        return self._adj
 
     def load_image(self, index: int) -> None:
         """Load the image and associated boxes at ``index`` into the scene."""
@@ -201,66 +705,317 @@ class AnnotationWindow(QMainWindow):
         v_val = self.view.verticalScrollBar().value()
         transform = self.view.transform()
 
-        self.scene.clear()
-        self.pred_items = []
-        self.gt_items = []
-        self.final_items = []
         self.index = index
 
-        img = self.images[index]
-        pixmap = self.pil_to_pixmap(self.adjust_image(img))
-        self.background_item = QGraphicsPixmapItem(pixmap)
-        self.scene.addItem(self.background_item)
-
-        img_w = pixmap.width()
-        img_h = pixmap.height()
-
-        for state in self.pred_states[index]:
-            rect = yolo_line_to_rect(state["line"], img_w, img_h)
-            item = PredBox(rect, state, self.class_names, self, img_w, img_h)
-            item.setVisible(self.pred_checkbox.isChecked())
-            self.scene.addItem(item)
-            self.pred_items.append(item)
-
-        for state in self.gt_states[index]:
-            rect = yolo_line_to_rect(state["line"], img_w, img_h)
-            item = GTBox(rect, state, self.class_names, self, img_w, img_h)
-            item.setVisible(self.gt_checkbox.isChecked())
-            self.scene.addItem(item)
-            self.gt_items.append(item)
-
+        # One repaint for the whole swap: suspend viewport updates while
+        # the background, boxes and overlays are rebound in bulk, then
+        # flush a single update at the end.
+        self.view.setUpdatesEnabled(False)
+        try:
+            self._last_display_key = (
+                index,
+                self.brightness_slider.value(),
+                self.contrast_slider.value(),
+            )
+            pixmap = self._display_pixmap(self._last_display_key)
+            if self.background_item is None:
+                self.background_item = QGraphicsPixmapItem(pixmap)
+                # Cache the rasterized image in device coordinates so pans
+                # and overlay toggles blit the cache instead of rescaling the
+                # full pixmap every repaint.
+                self.background_item.setCacheMode(
+                    QGraphicsItem.CacheMode.DeviceCoordinateCache
+                )
+                self.background_item.setTransformationMode(
+                    Qt.TransformationMode.SmoothTransformation
+                )
+                self.scene.addItem(self.background_item)
+            else:
+                self.background_item.setPixmap(pixmap)
+
+            img_w = pixmap.width()
+            img_h = pixmap.height()
+            self.img_w = img_w
+            self.img_h = img_h
+
+            # Suspend BSP indexing while boxes are inserted or rebound in
+            # bulk; the index is rebuilt once when restored below instead of
+            # after every addItem/setRect.
+            self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+            # Numeric box data is parsed once per image into arrays; pooled
+            # items are rebound in place instead of torn down and rebuilt.
+            # Revisited images pull the arrays straight from the cache.
+            cached = self._parse_cache.get(index)
+            if cached is not None:
+                (
+                    self.pred_cls,
+                    self.pred_xywhn,
+                    pred_rects,
+                    self.gt_cls,
+                    self.gt_xywhn,
+                    gt_rects,
+                ) = cached
+                self._parse_cache.move_to_end(index)
+            else:
+                self.pred_cls, self.pred_xywhn = parse_states(
+                    self.pred_states[index]
+                )
+                pred_rects = xywhn_to_rects(self.pred_xywhn, img_w, img_h)
+                self.gt_cls, self.gt_xywhn = parse_states(self.gt_states[index])
+                gt_rects = xywhn_to_rects(self.gt_xywhn, img_w, img_h)
+                self._parse_cache[index] = (
+                    self.pred_cls,
+                    self.pred_xywhn,
+                    pred_rects,
+                    self.gt_cls,
+                    self.gt_xywhn,
+                    gt_rects,
+                )
+                while len(self._parse_cache) > IMAGE_CACHE_SIZE:
+                    self._parse_cache.popitem(last=False)
+
+            self.pred_items = self._bind_pool(
+                self._pred_pool,
+                self.pred_states[index],
+                pred_rects,
+                PredBox,
+                self.pred_group,
+            )
+            self.pred_group.setVisible(self.pred_checkbox.isChecked())
+
+            self.gt_items = self._bind_pool(
+                self._gt_pool,
+                self.gt_states[index],
+                gt_rects,
+                GTBox,
+                self.gt_group,
+            )
+            self.gt_group.setVisible(self.gt_checkbox.isChecked())
+
+            self.flag_predictions()
+            self.update_final_items()
+
+            # Boxes are static outside resize drags, so for modest counts a
+            # linear scan beats maintaining the BSP tree; only dense scenes
+            # get the index back.
+            n_items = len(self.pred_items) + len(self.gt_items)
+            self.scene_index_method = (
+                QGraphicsScene.ItemIndexMethod.NoIndex
+                if n_items < 500
+                else QGraphicsScene.ItemIndexMethod.BspTreeIndex
+            )
+            self.scene.setItemIndexMethod(self.scene_index_method)
+
+            # Same threshold for repaint scheduling: when flag_predictions
+            # restyles hundreds of boxes at once, computing per-item dirty
+            # regions costs more than repainting the viewport outright.
+            self.view.setViewportUpdateMode(
+                ZoomableGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+                if n_items < 500
+                else ZoomableGraphicsView.ViewportUpdateMode.FullViewportUpdate
+            )
+
+            # Restore previous view parameters
+            self.view.setTransform(transform)
+            self.view.horizontalScrollBar().setValue(h_val)
+            self.view.verticalScrollBar().setValue(v_val)
+
+        finally:
+            self.view.setUpdatesEnabled(True)
+            self.view.viewport().update()
+        self.preload_neighbors()
+        # Once the event loop is idle, also render the neighbours'
+        # pixmaps so navigation is a pure cache hit.
+        QTimer.singleShot(0, self._warm_neighbor_pixmaps)
+
+    def _bind_pool(
+        self,
+        pool: List,
+        states: List[dict],
+        rects: np.ndarray,
+        factory,
+        group: QGraphicsRectItem,
+    ) -> List:
+        """Rebind pooled box items to ``states``; return the live slice.
+
+        Shared by the prediction and ground-truth loops in
+        :meth:`load_image`.  The lookups that do not change per box are
+        hoisted so each iteration is just the rebind (or construction)
+        plus one visibility update.  Items are parented to ``group``, so
+        layer-level visibility is the caller's single ``setVisible`` on
+        the group rather than a per-item concern here.
+        """
+
+        img_w = self.img_w
+        img_h = self.img_h
+        class_names = self.class_names
+        n_pool = len(pool)
+        for i, (state, (x1, y1, w, h)) in enumerate(zip(states, rects)):
+            rect = QRectF(x1, y1, w, h)
+            if i < n_pool:
+                item = pool[i]
+                item.rebind(rect, state, img_w, img_h)
+            else:
+                item = factory(rect, state, class_names, self, img_w, img_h)
+                item.setParentItem(group)
+                pool.append(item)
+            item.setVisible(True)
+        for item in pool[len(rects):]:
+            item.setVisible(False)
+        return pool[: len(rects)]
+
+    def refresh_annotations(self) -> None:
+        """Recompute prediction flags and the final overlay immediately."""
+
+        # A refresh means geometry changed; the cached arrays for this
+        # image are stale.
+        self._parse_cache.pop(self.index, None)
         self.flag_predictions()
-        self.update_final_items()
-
-        # Restore previous view parameters
-        self.view.setTransform(transform)
-        self.view.horizontalScrollBar().setValue(h_val)
-        self.view.verticalScrollBar().setValue(v_val)
+        if self.final_checkbox.isChecked():
+            self.update_final_items()
 
     def flag_predictions(self) -> None:
         """Highlight predictions that do not match any ground truth box."""
 
-        for p in self.pred_items:
-            best_iou = 0.0
-            best_gt = None
-            for g in self.gt_items:
-                if not g.kept:
-                    continue
-                i = iou(p.rect(), g.rect())
-                if i > best_iou:
-                    best_iou = i
-                    best_gt = g
-            if best_iou == 0 or (best_gt and p.line.split()[0] != best_gt.line.split()[0]):
-                p.setPen(QPen(QColor(255, 191, 0), 2))
-            else:
-                p.setPen(QPen(QColor("red"), 2))
+        if not self.pred_items:
+            return
+        # The cached parse tuples track the live geometry (resize drags
+        # re-sync them on release), so matching runs purely on the
+        # struct-of-arrays mirrors without per-item Qt rect() calls.
+        # IoU is invariant under per-axis scaling, so the normalized
+        # coordinates are compared directly.
+        self.pred_cls, self.pred_xywhn = parse_states(self.pred_states[self.index])
+        self.gt_cls, self.gt_xywhn = parse_states(self.gt_states[self.index])
+        pred = xywhn_to_rects(self.pred_xywhn, 1, 1)
+        n_gt = len(self.gt_states[self.index])
+        kept_mask = np.fromiter(
+            (s.get("kept", True) for s in self.gt_states[self.index]),
+            dtype=bool,
+            count=n_gt,
+        )
+        if kept_mask.any():
+            kept_idx = np.nonzero(kept_mask)[0]
+            gt = xywhn_to_rects(self.gt_xywhn[kept_mask], 1, 1)
+            # One broadcasted IoU matrix and per-prediction argmax replace
+            # the former nested loop of QRectF intersections.
+            ious = iou_matrix(pred, gt)
+            best = ious.argmax(axis=1)
+            best_iou = ious[np.arange(len(pred)), best]
+            best_gt = kept_idx[best]
+        else:
+            best_gt = np.full(len(self.pred_items), -1)
+            best_iou = np.zeros(len(self.pred_items))
+        self._pred_best_gt = best_gt
+        self._pred_best_iou = best_iou
+        self._apply_pred_pens(range(len(self.pred_items)))
+
+    def _apply_pred_pens(self, indices) -> None:
+        """Restyle the predictions at ``indices`` from the match cache.
+
+        The match/mismatch decision is evaluated as one branchless mask
+        over the cached arrays; the Python loop only dispatches setPen
+        with the shared pen instances.
+        """
+
+        idx = np.asarray(indices, dtype=np.intp)
+        best_gt = self._pred_best_gt[idx]
+        if self.gt_cls.size:
+            # Clamp unmatched entries to a valid index for the gather;
+            # the best_gt >= 0 term masks them out of the result.
+            cls_ok = self.pred_cls[idx] == self.gt_cls[
+                np.where(best_gt < 0, 0, best_gt)
+            ]
+        else:
+            cls_ok = False
+        matched = (best_gt >= 0) & (self._pred_best_iou[idx] > 0.0) & cls_ok
+        items = self.pred_items
+        for i, ok in zip(idx, matched):
+            items[i].setPen(_MATCHED_PEN if ok else _UNMATCHED_PEN)
+
+    def flag_gt_toggled(self, state: dict) -> None:
+        """Patch prediction flags after one GT box flipped ``kept``.
+
+        A single toggle cannot change the best match of most
+        predictions: a newly kept box can only improve matches (one
+        O(P) challenge pass), and an unkept box only invalidates the
+        predictions that were matched to it (re-scanned against the
+        remaining kept boxes).  Everything else keeps its cached match
+        and its pen.
+        """
+
+        states = self.gt_states[self.index]
+        if (
+            not self.pred_items
+            or self._pred_best_gt is None
+            or len(self._pred_best_gt) != len(self.pred_items)
+        ):
+            self.flag_predictions()
+            return
+        # Identity search: equal-valued duplicate boxes must not alias.
+        for j, s in enumerate(states):
+            if s is state:
+                break
+        else:
+            self.flag_predictions()
+            return
+        if state.get("kept", True):
+            gt_box = xywhn_to_rects(self.gt_xywhn[j : j + 1], 1, 1)
+            pred = xywhn_to_rects(self.pred_xywhn, 1, 1)
+            ious = iou_matrix(pred, gt_box)[:, 0]
+            improved = ious > self._pred_best_iou
+            if not improved.any():
+                return
+            self._pred_best_iou[improved] = ious[improved]
+            self._pred_best_gt[improved] = j
+            self._apply_pred_pens(np.nonzero(improved)[0])
+            return
+        affected = np.nonzero(self._pred_best_gt == j)[0]
+        if not len(affected):
+            return
+        kept_mask = np.fromiter(
+            (s.get("kept", True) for s in states), dtype=bool, count=len(states)
+        )
+        pred = xywhn_to_rects(self.pred_xywhn[affected], 1, 1)
+        if kept_mask.any():
+            kept_idx = np.nonzero(kept_mask)[0]
+            gt = xywhn_to_rects(self.gt_xywhn[kept_mask], 1, 1)
+            ious = iou_matrix(pred, gt)
+            best = ious.argmax(axis=1)
+            self._pred_best_gt[affected] = kept_idx[best]
+            self._pred_best_iou[affected] = ious[
+                np.arange(len(affected)), best
+            ]
+        else:
+            self._pred_best_gt[affected] = -1
+            self._pred_best_iou[affected] = 0.0
+        self._apply_pred_pens(affected)
+
+    def schedule_display_update(self) -> None:
+        """Request a background redraw, coalescing slider bursts.
+
+        ``valueChanged`` fires for every intermediate position during a
+        drag; a short single-shot timer caps the pixmap rebuild rate at
+        roughly 60 Hz.  The timer is only armed when idle — restarting
+        it per tick would push the deadline ahead of every event and
+        freeze the preview for the whole drag.
+        """
+
+        if not self._display_timer.isActive():
+            self._display_timer.start()
 
     def update_image_display(self) -> None:
         """Refresh the background image after adjustment changes."""
 
-        img = self.images[self.index]
-        pixmap = self.pil_to_pixmap(self.adjust_image(img))
-        self.background_item.setPixmap(pixmap)
+        key = (
+            self.index,
+            self.brightness_slider.value(),
+            self.contrast_slider.value(),
+        )
+        if key == self._last_display_key:
+            return
+        self._last_display_key = key
+        self.background_item.setPixmap(self._display_pixmap(key))
 
     # ------------------------------------------------------------------
     # Navigation and saving
@@ -300,27 +1055,52 @@ class AnnotationWindow(QMainWindow):
     def save_all(self) -> None:
         """Write all accepted/kept label lines back to disk."""
 
+        # All label files live in the corrected directory created at
+        # startup, so make each directory at most once per window — the
+        # set persists across saves, so repeat Save clicks skip the
+        # stat/mkdir syscalls entirely.
+        seen_dirs = self._made_dirs
         for idx, label_file in enumerate(self.label_files):
             lines = self.collect_lines(idx)
-            os.makedirs(os.path.dirname(label_file), exist_ok=True)
+            body = "\n".join(lines) + ("\n" if lines else "")
+            # Repeat saves only touch files whose content changed since
+            # the last write; unchanged images cost a string compare
+            # instead of an unlink + write.
+            if self._saved_bodies.get(idx) == body:
+                continue
+            directory = os.path.dirname(label_file)
+            if directory and directory not in seen_dirs:
+                os.makedirs(directory, exist_ok=True)
+                seen_dirs.add(directory)
+            # The corrected file may be hard-linked to the original label
+            # (see fast_copy in annotation_corrector); unlink before
+            # rewriting so the original is never modified in place.
+            try:
+                os.unlink(label_file)
+            except FileNotFoundError:
+                pass
+            # One write call per file instead of one per line.
             with open(label_file, "w") as f:
-                for line in lines:
-                    f.write(line + "\n")
+                f.write(body)
+            self._saved_bodies[idx] = body
 
     # ------------------------------------------------------------------
     # Visibility toggles and preview
     # ------------------------------------------------------------------
     def toggle_predictions(self, state: bool) -> None:
-        """Show or hide predicted boxes."""
+        """Show or hide predicted boxes.
+
+        Flips one flag on the layer parent; Qt propagates the effective
+        visibility to the children, so the cost no longer scales with the
+        number of boxes on screen.
+        """
 
-        for item in self.pred_items:
-            item.setVisible(state)
+        self.pred_group.setVisible(state)
 
     def toggle_gt(self, state: bool) -> None:
         """Show or hide ground-truth boxes."""
 
-        for item in self.gt_items:
-            item.setVisible(state)
+        self.gt_group.setVisible(state)
 
     def toggle_final(self, state: bool) -> None:  # noqa: ARG002 - slot signature
         """Update final annotation overlay when checkbox changes."""
@@ -328,51 +1108,65 @@ class AnnotationWindow(QMainWindow):
         self.update_final_items()
 
     def update_final_items(self) -> None:
-        """Draw overlays for the final set of annotations."""
-
-        for item in self.final_items:
-            self.scene.removeItem(item)
-        self.final_items = []
-        if not self.final_checkbox.isChecked():
-            return
-        for item in self.gt_items:
-            if item.kept:
-                rect = QGraphicsRectItem(item.rect())
-                rect.setPen(QPen(QColor("blue"), 2))
-                self.scene.addItem(rect)
-                self.final_items.append(rect)
-                cls_id = int(item.line.split()[0])
-                cls_name = (
-                    self.class_names[cls_id]
-                    if 0 <= cls_id < len(self.class_names)
-                    else str(cls_id)
-                )
-                label = QGraphicsTextItem()
-                label.setHtml(
-                    f"<div style='color:blue;background-color:white;'>{cls_name}</div>"
-                )
-                label.setPos(item.rect().left(), item.rect().top() - 20)
-                self.scene.addItem(label)
-                self.final_items.append(label)
-        for item in self.pred_items:
-            if item.accepted:
-                rect = QGraphicsRectItem(item.rect())
-                rect.setPen(QPen(QColor("blue"), 2))
-                self.scene.addItem(rect)
-                self.final_items.append(rect)
-                cls_id = int(item.line.split()[0])
-                cls_name = (
-                    self.class_names[cls_id]
-                    if 0 <= cls_id < len(self.class_names)
-                    else str(cls_id)
-                )
-                label = QGraphicsTextItem()
-                label.setHtml(
-                    f"<div style='color:blue;background-color:white;'>{cls_name}</div>"
-                )
-                label.setPos(item.rect().left(), item.rect().top() - 20)
-                self.scene.addItem(label)
-                self.final_items.append(label)
+        """Draw overlays for the final set of annotations.
+
+        All rectangles are painted by one aggregated overlay item, and
+        the class labels live in a persistent pool that is rebound in
+        place, so toggles and resizes never remove or recreate items.
+        """
+
+        entries: List[Tuple[QRectF, int]] = []
+        if self.final_checkbox.isChecked():
+            entries = [
+                (item.rect(), item.cls_id) for item in self.gt_items if item.kept
+            ]
+            entries += [
+                (item.rect(), item.cls_id)
+                for item in self.pred_items
+                if item.accepted
+            ]
+        self._final_overlay.set_rects([r for r, _ in entries])
+        self._final_overlay.setVisible(bool(entries))
+        for i, (rect, cls_id) in enumerate(entries):
+            self._bind_final_label(i, rect, cls_id)
+        for label in self._final_pool[len(entries):]:
+            label.setVisible(False)
+        self.final_items = [self._final_overlay] + self._final_pool[: len(entries)]
+
+    def _bind_final_label(self, i: int, rect: QRectF, cls_id: int) -> None:
+        """Bind label pool slot ``i`` to a final overlay entry."""
+
+        if i < len(self._final_pool):
+            label = self._final_pool[i]
+        else:
+            # Simple text items render through plain drawText — no
+            # QTextDocument or HTML parsing per label.  The white
+            # backdrop is a child rect stacked behind the glyphs.
+            label = QGraphicsSimpleTextItem()
+            label.setBrush(_FINAL_TEXT_BRUSH)
+            label.setZValue(1)
+            backdrop = QGraphicsRectItem(label)
+            backdrop.setFlag(
+                QGraphicsItem.GraphicsItemFlag.ItemStacksBehindParent
+            )
+            backdrop.setBrush(_FINAL_BG_BRUSH)
+            backdrop.setPen(_FINAL_NO_PEN)
+            label._backdrop = backdrop
+            self.scene.addItem(label)
+            self._final_pool.append(label)
+        # Rebinding usually hands a slot the same class it showed last
+        # time; skip the relayout (and backdrop resize) when it did.
+        if getattr(label, "_cls_id", None) != cls_id:
+            cls_name = (
+                self.class_names[cls_id]
+                if 0 <= cls_id < len(self.class_names)
+                else str(cls_id)
+            )
+            label.setText(cls_name)
+            label._backdrop.setRect(label.boundingRect())
+            label._cls_id = cls_id
+        label.setPos(rect.left(), rect.top() - 20)
+        label.setVisible(True)
 
     def preview(self) -> None:
         """Display a message box with the final labels for the current image."""
@@ -389,10 +1183,69 @@ def run_interface(
     label_files: List[str],
     class_names: List[str],
 ) -> None:
-    """Launch the PyQt6 interface for multiple images."""
+    """Launch the PyQt6 interface for multiple images.
+
+    One window and one ``app.exec()`` cover the whole batch: navigation
+    swaps image and box contents in-place via ``load_image``, so caches
+    (decoded images, pooled graphics items) persist across images and
+    the event loop is only entered once.
+
+    ``images`` may contain PIL images or file paths; paths are decoded
+    lazily inside the window so arbitrarily large datasets fit in memory.
+    """
 
     app = QApplication.instance() or QApplication([])
     window = AnnotationWindow(images, predictions, labels, label_files, class_names)
     window.show()
     app.exec()
 
+
+async def run_interface_async(
+    images: List,
+    predictions: List[List[dict]],
+    labels: List[List[dict]],
+    label_files: List[str],
+    class_names: List[str],
+) -> None:
+    """Run the annotation window cooperatively inside a qasync loop.
+
+    Must be awaited under a ``qasync.QEventLoop`` (e.g. via
+    ``qasync.run(...)``), which drives the Qt event loop as an asyncio
+    loop; a batch driver can then await this next to other coroutines
+    (e.g. prefetching the next dataset) instead of blocking on
+    :func:`run_interface`.  Under a plain asyncio loop Qt events would
+    never be processed and the window could never close, so that is
+    rejected up front.  Like numba, qasync is an optional extra and is
+    not listed in requirements.
+    """
+
+    try:
+        import qasync
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "run_interface_async requires the optional qasync package; "
+            "use run_interface for the blocking entry point"
+        ) from e
+
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, qasync.QEventLoop):
+        raise RuntimeError(
+            "run_interface_async must be awaited under a qasync.QEventLoop "
+            "(e.g. qasync.run(...)); a plain asyncio loop never processes "
+            "Qt events"
+        )
+
+    app = QApplication.instance() or QApplication([])
+    window = AnnotationWindow(images, predictions, labels, label_files, class_names)
+    done: asyncio.Future = loop.create_future()
+
+    def _on_quit() -> None:
+        if not done.done():
+            done.set_result(None)
+
+    app.lastWindowClosed.connect(_on_quit)  # signal/slot
+    window.show()
+    await done
+